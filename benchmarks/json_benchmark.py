@@ -0,0 +1,40 @@
+'''Compares decode time of the unit test fixtures across the installed JSON backends
+
+Each fixture is read as bytes like a response body and decoded repeatedly
+with every available backend from espn_api.utils.json_backend.
+
+    PYTHONPATH=. python benchmarks/json_benchmark.py [repeat]
+'''
+import glob
+import os
+import sys
+import timeit
+
+from espn_api.utils import json_backend
+
+FIXTURES = 'tests/football/unit/data/*.json'
+
+
+def main(repeat: int = 20):
+    backends = json_backend.available_backends()
+    print(f'backends: {", ".join(backends)} (default {json_backend.get_backend()})')
+
+    totals = dict.fromkeys(backends, 0.0)
+    for path in sorted(glob.glob(FIXTURES)):
+        with open(path, 'rb') as f:
+            body = f.read()
+        timings = []
+        for name in backends:
+            loads = json_backend.BACKENDS[name][0]
+            seconds = min(timeit.repeat(lambda: loads(body), number=1, repeat=repeat))
+            totals[name] += seconds
+            timings.append(f'{name} {seconds * 1000:7.2f}ms')
+        print(f'{os.path.basename(path):35} {len(body) / 1024:7.0f} KiB  ' + '  '.join(timings))
+
+    baseline = totals['json']
+    for name in backends:
+        print(f'{name:7} total {totals[name] * 1000:8.2f}ms  {baseline / totals[name]:.2f}x stdlib')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,68 @@
+'''Compares the memory held by slotted model objects against dict backed copies
+
+Builds BoxPlayers from the free agent fixture once per simulated league,
+decoding the payload fresh each time like separate API responses would,
+and reports the bytes retained with the slotted classes versus the same
+attributes stored in a per instance __dict__ without string interning.
+
+    PYTHONPATH=. python benchmarks/memory_benchmark.py [leagues]
+'''
+import gc
+import json
+import sys
+import tracemalloc
+
+from espn_api.football import BoxPlayer
+
+FIXTURE = 'tests/football/unit/data/league_free_agents_2018.json'
+
+
+class DictBoxPlayer(object):
+    '''Plain object with the same public attributes as a BoxPlayer'''
+    def __init__(self, player):
+        for cls in type(player).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if hasattr(player, name):
+                    value = getattr(player, name)
+                    # undo interning so every instance owns its strings like before
+                    setattr(self, name, ''.join(value) if isinstance(value, str) else value)
+
+
+def build(payload: str, leagues: int, dict_backed: bool):
+    players = []
+    for _ in range(leagues):
+        for data in json.loads(payload)['players']:
+            player = BoxPlayer(data, {}, {}, 1, 2018)
+            players.append(DictBoxPlayer(player) if dict_backed else player)
+    return players
+
+
+def measure(payload: str, leagues: int, dict_backed: bool):
+    gc.collect()
+    tracemalloc.start()
+    players = build(payload, leagues, dict_backed)
+    gc.collect()
+    (current, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (len(players), current)
+
+
+def main(leagues: int = 20):
+    with open(FIXTURE) as f:
+        payload = f.read()
+
+    (count, dict_bytes) = measure(payload, leagues, dict_backed=True)
+    (_, slot_bytes) = measure(payload, leagues, dict_backed=False)
+    print(f'players: {count}')
+    print(f'dict backed: {dict_bytes / 1024:.0f} KiB ({dict_bytes / count:.0f} B/player)')
+    print(f'slotted:     {slot_bytes / 1024:.0f} KiB ({slot_bytes / count:.0f} B/player)')
+    print(f'reduction:   {100 * (1 - slot_bytes / dict_bytes):.1f}%')
+
+    # object overhead alone, excluding the attribute values both variants share
+    player = build(payload, 1, dict_backed=False)[0]
+    copy = DictBoxPlayer(player)
+    print(f'instance size: slotted {sys.getsizeof(player)} B, dict backed {sys.getsizeof(copy) + sys.getsizeof(copy.__dict__)} B')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -5,17 +5,32 @@ from .base_settings import BaseSettings
 from .base_pick import BasePick
 from .utils.logger import Logger
 from .requests.espn_requests import EspnFantasyRequests
+from .requests.transport import Transport
+from .requests.cache import ResponseCache
+from .player_directory import get_player_directory
 
 class BaseLeague(ABC):
     '''Creates a League instance for Public/Private ESPN league'''
-    def __init__(self, league_id: int, year: int, sport: str, espn_s2=None, swid=None, debug=False):
-        self.logger = Logger(name=f'{sport} league', debug=debug)
+    def __init__(self, league_id: int, year: int, sport: str, espn_s2=None, swid=None, debug=False, transport: Transport = None, cache: ResponseCache = None, metrics=None, log_body_limit: int = None):
+        # log_body_limit keeps debug logs of large views short, see Logger
+        self.logger = Logger(name=f'{sport} league', debug=debug, body_limit=log_body_limit)
         self.league_id = league_id
         self.year = year
         self.teams = []
         self.members = []
         self.draft = []
-        self.player_map = {}
+        # id <-> name map shared with every league of the same sport and year in the process
+        self.player_directory = get_player_directory(sport, year)
+        self.player_map = self.player_directory
+        # id lookups for teams and rostered players, rebuilt whenever rosters change
+        self._team_index = {}
+        self._player_index = {}
+        self._player_team_index = {}
+        self._draft_data = None
+        # (league data, pro schedule data) the teams were last built from
+        self._teams_source = (None, None)
+        # set when rosters were replaced by another week so the next refresh parses them again
+        self._rosters_stale = False
 
         cookies = None
         if espn_s2 and swid:
@@ -23,14 +38,16 @@ class BaseLeague(ABC):
                 'espn_s2': espn_s2,
                 'SWID': swid
             }
-        self.espn_request = EspnFantasyRequests(sport=sport, year=year, league_id=league_id, cookies=cookies, logger=self.logger)
+        self.espn_request = EspnFantasyRequests(sport=sport, year=year, league_id=league_id, cookies=cookies, logger=self.logger, transport=transport, cache=cache, metrics=metrics)
 
     def __repr__(self):
         return 'League(%s, %s)' % (self.league_id, self.year, )
 
     def _fetch_league(self, SettingsClass = BaseSettings):
         data = self.espn_request.get_league()
+        return self._parse_league(data, SettingsClass)
 
+    def _parse_league(self, data, SettingsClass = BaseSettings):
         self.currentMatchupPeriod = data['status']['currentMatchupPeriod']
         self.scoringPeriodId = data['scoringPeriodId']
         self.firstScoringPeriod = data['status']['firstScoringPeriod']
@@ -49,7 +66,11 @@ class BaseLeague(ABC):
     def _fetch_draft(self):
         '''Creates list of Pick objects from the leagues draft'''
         data = self.espn_request.get_league_draft()
+        self._parse_draft(data)
 
+    def _parse_draft(self, data):
+        self._draft_data = data
+        self.draft = []
         # League has not drafted yet
         if not data.get('draftDetail', {}).get('drafted'):
             return
@@ -58,9 +79,7 @@ class BaseLeague(ABC):
         for pick in picks:
             team = self.get_team_data(pick.get('teamId'))
             playerId = pick.get('playerId')
-            playerName = ''
-            if playerId in self.player_map:
-                playerName = self.player_map[playerId]
+            playerName = self._get_player_name(playerId)
             round_num = pick.get('roundId')
             round_pick = pick.get('roundPickNumber')
             bid_amount = pick.get('bidAmount')
@@ -83,24 +102,86 @@ class BaseLeague(ABC):
         for team in teams:
             roster = team_roster[team['id']]
             owners = [member for member in members if member.get('id') in team.get('owners', [])]
-            self.teams.append(TeamClass(team, roster=roster, schedule=schedule, year=seasonId, owners=owners, pro_schedule=pro_schedule))
+            # schedules are filled in below with a single pass for every team
+            self.teams.append(TeamClass(team, roster=roster, year=seasonId, owners=owners, pro_schedule=pro_schedule))
 
         # sort by team ID
         self.teams = sorted(self.teams, key=lambda x: x.team_id, reverse=False)
+        self._build_indexes()
+        self._fetch_schedule(schedule)
+
+    def _update_teams(self, data, pro_schedule = None, reparse_rosters = False) -> bool:
+        '''Updates the current teams in place, a roster is only parsed again when its players or slots changed
+
+        Returns False when the league now has other teams and has to be built again.
+        '''
+        teams = data['teams']
+        if sorted(team['id'] for team in teams) != [team.team_id for team in self.teams]:
+            return False
+        members = data.get('members', [])
+
+        for team_data in teams:
+            team = self._team_index[team_data['id']]
+            team._update(team_data)
+            team.owners = [member for member in members if member.get('id') in team_data.get('owners', [])]
+            roster = team_data.get('roster', {})
+            if reparse_rosters or team._get_roster_signature(roster) != team._roster_signature:
+                team._fetch_roster(roster, data['seasonId'], pro_schedule)
+            else:
+                team._update_roster(roster, data['seasonId'])
+            # cleared in place so lists callers hold stay current
+            for results in (team.schedule, team.scores, team.outcomes, team.mov):
+                results.clear()
+
+        self._build_indexes()
+        self._fetch_schedule(data['schedule'])
+        return True
+
+    def _fetch_schedule(self, schedule):
+        '''Sets schedule, scores, outcomes and margin of victory for all teams in one pass over the league schedule'''
+        for matchup in schedule:
+            home_team = matchup.get('home', {})
+            away_team = matchup.get('away', {})
+            home_id = home_team.get('teamId', -1)
+            away_id = away_team.get('teamId', -1)
+
+            for (current_team, current_id, other_team, opponent_id, away) in ((home_team, home_id, away_team, away_id, False), (away_team, away_id, home_team, home_id, True)):
+                team = self._team_index.get(current_id)
+                if team is None:
+                    continue
+                score = current_team.get('totalPoints')
+                # if bye week the team plays itself
+                if opponent_id == -1:
+                    (opponent, opponent_score) = (team, score)
+                else:
+                    (opponent, opponent_score) = (self._team_index.get(opponent_id, opponent_id), other_team.get('totalPoints'))
+
+                team.outcomes.append(team._get_winner(matchup['winner'], away))
+                team.scores.append(score)
+                team.schedule.append(opponent)
+                team.mov.append(score - opponent_score)
+
+    def _build_indexes(self):
+        '''Rebuilds the team and rostered player lookups'''
+        self._team_index = {}
+        self._player_index = {}
+        self._player_team_index = {}
+        for team in self.teams:
+            self._team_index[team.team_id] = team
+            for player in team.roster:
+                self._player_index[player.playerId] = player
+                self._player_team_index[player.playerId] = team
 
     def _fetch_players(self):
-        data = self.espn_request.get_pro_players()
-        # Map all player id's to player name
-        for player in data:
-            # two way map to find playerId's by name
-            self.player_map[player['id']] = player['fullName']
-            # if two players have the same fullname use first one for now TODO update for multiple player names
-            if player['fullName'] not in self.player_map:
-                self.player_map[player['fullName']] = player['id']
+        # only downloaded when no league loaded this season yet or it is stale, streamed so the full list is never held
+        self.player_directory.ensure(self.espn_request.iter_pro_players)
+        self.player_map = self.player_directory
 
     def _get_pro_schedule(self, scoringPeriodId: int = None):
         data = self.espn_request.get_pro_schedule()
+        return self._parse_pro_schedule(data, scoringPeriodId)
 
+    def _parse_pro_schedule(self, data, scoringPeriodId: int = None):
         pro_teams = data['settings']['proTeams']
         pro_team_schedule = {}
 
@@ -113,7 +194,9 @@ class BaseLeague(ABC):
     
     def _get_all_pro_schedule(self):
         data = self.espn_request.get_pro_schedule()
+        return self._parse_all_pro_schedule(data)
 
+    def _parse_all_pro_schedule(self, data):
         pro_teams = data.get('settings', {}).get('proTeams', {})
         pro_team_schedule = {}
 
@@ -126,8 +209,16 @@ class BaseLeague(ABC):
         standings = sorted(self.teams, key=lambda x: x.final_standing if x.final_standing != 0 else x.standing, reverse=False)
         return standings
 
+    def _get_player_name(self, playerId: int) -> str:
+        '''Name of a rostered player, otherwise from the player map'''
+        player = self._player_index.get(playerId)
+        if player is not None:
+            return player.name
+        return self.player_map.get(playerId, '')
+
     def get_team_data(self, team_id: int) -> List:
-        for team in self.teams:
-            if team_id == team.team_id:
-                return team
-        return None
+        return self._team_index.get(team_id)
+
+    def get_player_team(self, playerId: int):
+        '''Returns the team a player is rostered on'''
+        return self._player_team_index.get(playerId)
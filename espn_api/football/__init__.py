@@ -1,4 +1,5 @@
 __all__ = ['League',
+           'AsyncLeague',
            'Team',
            'Matchup',
            'Player',
@@ -6,10 +7,14 @@ __all__ = ['League',
            'GoogleSheetService',
            'FantasyPlayer',
            'FantasyAward',
-           'FantasyTeamPerformance'
+           'FantasyTeamPerformance',
+           'LiveScoreboard',
+           'LeagueHistory',
+           'LeagueManager'
            ]
 
 from .league import League
+from .async_league import AsyncLeague
 from .team import Team
 from .matchup import Matchup
 from .player import Player
@@ -18,3 +23,6 @@ from .sheets import GoogleSheetService
 from .fantasy_player import FantasyAward
 from .fantasy_player import FantasyPlayer
 from .fantasy_player import FantasyTeamPerformance
+from .live import LiveScoreboard
+from .league_history import LeagueHistory
+from .league_manager import LeagueManager
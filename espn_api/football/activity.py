@@ -1,6 +1,8 @@
 from .constant import ACTIVITY_MAP
 
 class Activity(object):
+    __slots__ = ('actions', 'date')
+
     def __init__(self, data, player_map, get_team_data, player_info):
         self.actions = [] # List of tuples (Team, action, Player)
         self.date = data['date']
@@ -10,25 +12,27 @@ class Activity(object):
             player = None
             bid_amount = 0
             msg_id = msg['messageTypeId']
-            if msg_id == 244:
-                team = get_team_data(msg['from'])
-            elif msg_id == 239:
-                team = get_team_data(msg['for'])
-            else:
-                team = get_team_data(msg['to'])
+            team = get_team_data(self._get_team_id(msg))
             if msg_id in ACTIVITY_MAP:
                 action = ACTIVITY_MAP[msg_id]
             if action == 'WAIVER ADDED':
                 bid_amount = msg.get('from', 0)
             if team:
-                for team_player in team.roster:
-                    if team_player.playerId == msg['targetId']:
-                        player = team_player
-                        break
+                player = team.get_player(msg['targetId'])
             if not player:
                 player = player_info(playerId=msg['targetId'])
             self.actions.append((team, action, player, bid_amount))
 
+    @staticmethod
+    def _get_team_id(msg) -> int:
+        '''Returns the id of the team a message is about'''
+        msg_id = msg['messageTypeId']
+        if msg_id == 244:
+            return msg['from']
+        elif msg_id == 239:
+            return msg['for']
+        return msg['to']
+
     def __repr__(self):
         return 'Activity(' + ' '.join("(%s,%s,%s)" % tup[0:3] for tup in self.actions) + ')'
 
@@ -0,0 +1,179 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterator, Dict, List, Tuple, Union
+
+from ..requests.async_requests import AsyncEspnFantasyRequests
+from ..requests.transport import Transport
+from ..requests.cache import ResponseCache
+from .league import League
+from .matchup import Matchup
+from .box_score import BoxScore
+from .box_player import BoxPlayer
+from .player import Player
+from .activity import Activity
+from .settings import Settings
+from .pro_schedule import ProSchedule
+from .player_resolver import chunk_player_ids
+
+
+class AsyncLeague(League):
+    '''League with awaitable network methods for use inside asyncio
+
+    Independent ESPN views are requested together with asyncio.gather. Every
+    method that makes a request is a coroutine, the requests themselves run
+    on a bounded thread pool (see AsyncEspnFantasyRequests) that executor
+    replaces. The league is not fetched on creation, await fetch_league() instead.
+    '''
+    def __init__(self, league_id: int, year: int, espn_s2=None, swid=None, debug=False, transport: Transport = None, executor: Executor = None, cache: ResponseCache = None, metrics=None, log_body_limit: int = None):
+        super().__init__(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid, fetch_league=False, debug=debug, transport=transport, cache=cache, metrics=metrics, log_body_limit=log_body_limit)
+        self.async_request = AsyncEspnFantasyRequests(self.espn_request, executor=executor)
+
+    def __repr__(self):
+        return 'AsyncLeague(%s, %s)' % (self.league_id, self.year, )
+
+    @classmethod
+    def _unfetched(cls, league_id: int, year: int, **kwargs) -> 'AsyncLeague':
+        return cls(league_id, year, **kwargs)
+
+    async def fetch_league(self):
+        (data, _, pro_schedule, draft) = await asyncio.gather(
+            self.async_request.get_league(),
+            self.async_request.run(self._fetch_players),
+            self._pro_schedule(),
+            self.async_request.get_league_draft(),
+        )
+        data = self._parse_league(data, Settings)
+        self._fetch_teams(data, pro_schedule)
+        self._parse_draft(draft)
+
+    async def _pro_schedule(self) -> ProSchedule:
+        '''The shared pro schedule, only fetched when no league of the season loaded it yet or it is stale'''
+        return await self.async_request.run(self._load_pro_schedule)
+
+    async def refresh(self):
+        '''Gets latest league data. This can be used instead of creating a new League class each week'''
+        (data, pro_schedule) = await asyncio.gather(
+            self.async_request.get_league(),
+            self._pro_schedule(),
+        )
+        self._refresh_teams(data, pro_schedule)
+
+    async def refresh_draft(self, refresh_players=False, refresh__teams=False):
+        self._parse_draft(await self.async_request.get_league_draft())
+        if refresh_players:
+            await self.async_request.run(self._fetch_players)
+        if refresh__teams:
+            await self.refresh()
+
+    async def load_roster_week(self, week: int) -> None:
+        '''Sets Teams Roster for a Certain Week'''
+        params = {
+            'view': 'mRoster',
+            'scoringPeriodId': week
+        }
+        self._set_roster_week(await self.async_request.league_get(params=params))
+
+    async def scoreboard(self, week: int = None) -> List[Matchup]:
+        '''Returns list of matchups for a given week'''
+        if not week:
+            week = self.current_week
+        data = await self.async_request.get_matchup_scores([week])
+        return self._build_scoreboard(data['schedule'], week)
+
+    async def scoreboard_range(self, start: int = 1, end: int = None) -> Dict[int, List[Matchup]]:
+        '''Returns matchups by week for every week from start to end with a single request'''
+        if not end:
+            end = self.current_week
+        weeks = list(range(start, end + 1))
+        data = await self.async_request.get_matchup_scores(weeks)
+        return {week: self._build_scoreboard(data['schedule'], week) for week in weeks}
+
+    async def message_board(self, msg_types: List[str] = None) -> List[dict]:
+        ''' Returns a list of league messages'''
+        return self._parse_message_board(await self.async_request.get_league_message_board(msg_types))
+
+    async def box_scores(self, week: int = None) -> List[BoxScore]:
+        '''Returns list of box score for a given week\n
+        Should only be used with most recent season'''
+        if self.year < 2019:
+            raise Exception('Cant use box score before 2019')
+        (scoring_period, matchup_period) = self._box_score_periods(week)
+
+        (data, pro_schedule, positional_ratings) = await asyncio.gather(
+            self.async_request.get_box_scores(scoring_period, matchup_period),
+            self._pro_schedule(),
+            self.async_request.get_positional_ratings(scoring_period),
+        )
+        pro_schedule = pro_schedule.week(scoring_period)
+        positional_rankings = self._parse_positional_ratings(positional_ratings)
+        return self._build_box_scores(data, pro_schedule, positional_rankings, scoring_period)
+
+    async def box_scores_range(self, start: int = 1, end: int = None) -> AsyncIterator[Tuple[int, List[BoxScore]]]:
+        '''Yields (week, list of box scores) for every week from start to end as each one arrives
+
+        Weeks are requested concurrently and share the pro schedule and positional ratings'''
+        if self.year < 2019:
+            raise Exception('Cant use box score before 2019')
+        weeks = self._box_score_range_periods(start, end)
+        pro_schedule = await self._pro_schedule()
+
+        async def fetch(week: int, periods: Tuple[int, int]):
+            return (week, await self.async_request.get_box_scores(*periods))
+
+        ratings = {scoring_period: asyncio.ensure_future(self.async_request.get_positional_ratings(scoring_period)) for (scoring_period, _) in set(weeks.values())}
+        tasks = [asyncio.ensure_future(fetch(week, periods)) for (week, periods) in weeks.items()]
+        try:
+            for done in asyncio.as_completed(tasks):
+                (week, data) = await done
+                scoring_period = weeks[week][0]
+                positional_rankings = self._parse_positional_ratings(await ratings[scoring_period])
+                yield (week, self._build_box_scores(data, pro_schedule.week(scoring_period), positional_rankings, scoring_period))
+        finally:
+            for task in tasks + list(ratings.values()):
+                task.cancel()
+
+    async def free_agents(self, week: int=None, size: int=50, position: str=None, position_id: int=None) -> List[Player]:
+        '''Returns a List of Free Agents for a Given Week\n
+        Should only be used with most recent season'''
+        if self.year < 2019:
+            raise Exception('Cant use free agents before 2019')
+        if not week:
+            week = self.current_week
+
+        (data, pro_schedule, positional_ratings) = await asyncio.gather(
+            self.async_request.get_free_agents(week, size, self._free_agent_slot_filter(position, position_id)),
+            self._pro_schedule(),
+            self.async_request.get_positional_ratings(week),
+        )
+        pro_schedule = pro_schedule.week(week)
+        positional_rankings = self._parse_positional_ratings(positional_ratings)
+        return [BoxPlayer(player, pro_schedule, positional_rankings, week, self.year) for player in data['players']]
+
+    async def player_info(self, name: str = None, playerId: Union[int, list] = None, all_matches: bool = False) -> Union[Player, List[Player]]:
+        ''' Returns Player class if name found, a list of Players when given a list of ids
+
+        Players sharing a name are all returned as a list with all_matches, otherwise the first one'''
+        playerId = self._player_info_ids(name, playerId, all_matches)
+        if playerId is None:
+            return None
+
+        chunks = chunk_player_ids(playerId) or [playerId]
+        (pro_schedule, *cards) = await asyncio.gather(
+            self._pro_schedule(),
+            *[self.async_request.get_player_card(chunk, self.finalScoringPeriod) for chunk in chunks],
+        )
+        data = {'players': [player for card in cards for player in card['players']]}
+        return self._build_player_info(data, pro_schedule, bool(name) and all_matches)
+
+    async def recent_activity(self, size: int = 25, msg_type: str = None, offset: int = 0) -> List[Activity]:
+        '''Returns a list of recent league activities (Add, Drop, Trade)'''
+        if self.year < 2019:
+            raise Exception('Cant use recent activity before 2019')
+
+        data = await self.async_request.get_recent_activity(size, self._activity_msg_types(msg_type), offset)
+        data = data['topics']
+
+        # resolve every player missing from a roster in one batch, on the executor as it may hit the network
+        player_ids = self._unrostered_activity_players(data)
+        players = await self.async_request.run(self.player_resolver.resolve, player_ids)
+        return [Activity(topic, self.player_map, self.get_team_data, self._resolved_player_info(players)) for topic in data]
@@ -5,6 +5,9 @@ from datetime import datetime, timedelta
 
 class BoxPlayer(Player):
     '''player with extra data from a matchup'''
+    __slots__ = ('slot_position', 'pro_opponent', 'pro_pos_rank', 'game_played', 'on_bye_week', 'game_date',
+                 'points', 'points_breakdown', 'projected_points', 'projected_breakdown')
+
     def __init__(self, data, pro_schedule, positional_rankings, week, year):
         super(BoxPlayer, self).__init__(data, year)
         self.slot_position = 'FA'
@@ -28,7 +31,7 @@ class BoxPlayer(Player):
         else: # bye week
             self.on_bye_week = True
 
-        stats = self.stats.get(week, {})
+        stats = self._get_scoring_period_stats(week)
         self.points = stats.get('points', 0)
         self.points_breakdown = stats.get('breakdown', 0)
         self.projected_points = stats.get('projected_points', 0)
@@ -1,9 +1,13 @@
 from .box_player import BoxPlayer
+from .utils import intern_str
 
 class BoxScore(object):
     ''' '''
+    __slots__ = ('matchup_type', 'is_playoff', 'home_team', 'home_score', 'home_projected', 'home_lineup',
+                 'away_team', 'away_score', 'away_projected', 'away_lineup')
+
     def __init__(self, data, pro_schedule, positional_rankings, week, year):
-        self.matchup_type = data.get('playoffTierType', 'NONE') 
+        self.matchup_type = intern_str(data.get('playoffTierType', 'NONE'))
         self.is_playoff = self.matchup_type != 'NONE'
         
         (self.home_team, self.home_score, self.home_projected, self.home_lineup) = self._get_team_data('home', data, pro_schedule, positional_rankings, week, year)
@@ -1,8 +1,10 @@
-import json
 import random
-from typing import Callable, Dict, List, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Tuple, Union
 
 from ..base_league import BaseLeague
+from ..requests.transport import Transport
+from ..requests.cache import ResponseCache
 from .team import Team
 from .matchup import Matchup
 from .box_score import BoxScore
@@ -10,6 +12,9 @@ from .box_player import BoxPlayer
 from .player import Player
 from .activity import Activity
 from .settings import Settings
+from .pro_schedule import ProSchedule, get_pro_schedule, restore_pro_schedule
+from .player_resolver import PlayerResolver, chunk_player_ids
+from .snapshot import read_snapshot, write_snapshot
 from .utils import power_points, two_step_dominance
 from .constant import POSITION_MAP, ACTIVITY_MAP
 from .helper import (
@@ -25,48 +30,116 @@ from .helper import (
 
 class League(BaseLeague):
     '''Creates a League instance for Public/Private ESPN league'''
-    def __init__(self, league_id: int, year: int, espn_s2=None, swid=None, fetch_league=True, debug=False):
-        super().__init__(league_id=league_id, year=year, sport='nfl', espn_s2=espn_s2, swid=swid, debug=debug)
+    def __init__(self, league_id: int, year: int, espn_s2=None, swid=None, fetch_league=True, debug=False, transport: Transport = None, parallel_fetch=False, cache: ResponseCache = None, metrics=None, log_body_limit: int = None):
+        super().__init__(league_id=league_id, year=year, sport='nfl', espn_s2=espn_s2, swid=swid, debug=debug, transport=transport, cache=cache, metrics=metrics, log_body_limit=log_body_limit)
+        # request independent views at the same time instead of one after another
+        self.parallel_fetch = parallel_fetch
+        # players looked up by id for activity, batched and remembered for a few minutes
+        self.player_resolver = PlayerResolver(self._fetch_players_by_id)
 
         if fetch_league:
             self.fetch_league()
 
+    @classmethod
+    def _unfetched(cls, league_id: int, year: int, **kwargs) -> 'League':
+        return cls(league_id, year, fetch_league=False, **kwargs)
+
     def fetch_league(self):
         self._fetch_league()
 
+    def to_snapshot(self, path: str) -> None:
+        '''Saves the league views, pro schedule and player map so from_snapshot can rebuild the league offline'''
+        (data, pro_schedule) = self._teams_source
+        if data is None:
+            raise Exception('League has not been fetched')
+        views = [{'view': 'league', 'data': data}]
+        if self._draft_data is not None:
+            views.append({'view': 'draft', 'data': self._draft_data})
+        if pro_schedule is not None:
+            views.append({'view': 'pro_schedule', 'fetched': pro_schedule.fetched, 'games': pro_schedule.export_games()})
+        views.append({'view': 'players', 'fetched': self.player_directory.fetched, 'players': self.player_directory.pairs()})
+        write_snapshot(path, {'sport': 'nfl', 'league_id': self.league_id, 'year': self.year}, views)
+
+    @classmethod
+    def from_snapshot(cls, path: str, **kwargs) -> 'League':
+        '''Builds a league from a file written by to_snapshot without any request
+
+        kwargs are passed to the constructor, cookies are not saved so pass espn_s2
+        and swid again to make requests for a private league. The saved player map
+        and pro schedule become the shared ones of the season unless the process
+        already holds newer copies.
+        '''
+        snapshot = read_snapshot(path)
+        header = snapshot['header']
+        league = cls._unfetched(header['league_id'], header['year'], **kwargs)
+
+        players = snapshot.get('players')
+        if players and players['fetched'] is not None:
+            league.player_directory.restore(players['players'], players['fetched'])
+        pro_schedule = snapshot.get('pro_schedule')
+        if pro_schedule:
+            pro_schedule = restore_pro_schedule(league.year, ProSchedule.from_games(pro_schedule['games'], pro_schedule['fetched']))
+
+        data = league._parse_league(snapshot['league']['data'])
+        league._fetch_teams(data, pro_schedule)
+        if 'draft' in snapshot:
+            league._parse_draft(snapshot['draft']['data'])
+        return league
+
     def _fetch_league(self):
+        if self.parallel_fetch:
+            return self._fetch_league_parallel()
         data = super()._fetch_league(SettingsClass=Settings)
 
-        self.nfl_week = data['status']['latestScoringPeriod']
         self._fetch_players()
         self._fetch_teams(data)
         super()._fetch_draft()
 
-    def _fetch_teams(self, data):
+    def _fetch_league_parallel(self):
+        '''Fetches the league, player, pro schedule and draft views in a thread pool, then assembles them'''
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            league = executor.submit(self.espn_request.get_league)
+            players = executor.submit(self._fetch_players)
+            pro_schedule = executor.submit(self._load_pro_schedule)
+            draft = executor.submit(self.espn_request.get_league_draft)
+
+            data = self._parse_league(league.result(), Settings)
+            players.result()
+            self._fetch_teams(data, pro_schedule.result())
+            # draft names are resolved with the player map so it is parsed last
+            self._parse_draft(draft.result())
+
+    def _parse_league(self, data, SettingsClass = Settings):
+        data = super()._parse_league(data, SettingsClass)
+        self.nfl_week = data['status']['latestScoringPeriod']
+        return data
+
+    def _fetch_teams(self, data, pro_schedule: ProSchedule = None):
         '''Fetch teams in league'''
-        pro_schedule = self._get_all_pro_schedule()
+        if pro_schedule is None:
+            pro_schedule = self._load_pro_schedule()
         super()._fetch_teams(data, TeamClass=Team, pro_schedule=pro_schedule)
+        self._teams_source = (data, pro_schedule)
+        self._rosters_stale = False
 
-        # replace opponentIds in schedule with team instances
         for team in self.teams:
             team.division_name = self.settings.division_map.get(team.division_id, '')
-            for week, matchup in enumerate(team.schedule):
-                for opponent in self.teams:
-                    if matchup == opponent.team_id:
-                        team.schedule[week] = opponent
 
-        # calculate margin of victory
-        for team in self.teams:
-            for week, opponent in enumerate(team.schedule):
-                mov = team.scores[week] - opponent.scores[week]
-                team.mov.append(mov)
+    def _load_pro_schedule(self) -> ProSchedule:
+        '''The seasons pro schedule, shared with every other league of the same year'''
+        return get_pro_schedule(self.year, self.espn_request.get_pro_schedule)
+
+    def _get_pro_schedule(self, scoringPeriodId: int = None):
+        return self._load_pro_schedule().week(scoringPeriodId)
+
+    def _get_all_pro_schedule(self) -> ProSchedule:
+        return self._load_pro_schedule()
 
     def _get_positional_ratings(self, week: int):
-        params = {
-            'view': 'mPositionalRatings',
-            'scoringPeriodId': week,
-        }
-        data = self.espn_request.league_get(params=params)
+        data = self.espn_request.get_positional_ratings(week)
+        return self._parse_positional_ratings(data)
+
+    def _parse_positional_ratings(self, data):
         ratings = data.get('positionAgainstOpponent', {}).get('positionalRatings', {})
 
         positional_ratings = {}
@@ -79,17 +152,37 @@ class League(BaseLeague):
 
     def refresh(self):
         '''Gets latest league data. This can be used instead of creating a new League class each week'''
-        data = super()._fetch_league()
-
-        self.nfl_week = data['status']['latestScoringPeriod']
-        self._fetch_teams(data)
+        if self.parallel_fetch:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                league = executor.submit(self.espn_request.get_league)
+                pro_schedule = executor.submit(self._load_pro_schedule)
+                (data, pro_schedule) = (league.result(), pro_schedule.result())
+        else:
+            data = self.espn_request.get_league()
+            pro_schedule = self._load_pro_schedule()
+        self._refresh_teams(data, pro_schedule)
+
+    def _refresh_teams(self, data, pro_schedule: ProSchedule):
+        # the league view came back 304 Not Modified and the shared pro schedule is unchanged so the teams are up to date
+        if data is self._teams_source[0] and pro_schedule is self._teams_source[1] and not self._rosters_stale:
+            return
+        data = self._parse_league(data)
+        # players of a replaced pro schedule point at its games so their rosters are parsed again
+        reparse_rosters = self._rosters_stale or pro_schedule is not self._teams_source[1]
+        if self._update_teams(data, pro_schedule, reparse_rosters=reparse_rosters):
+            self._teams_source = (data, pro_schedule)
+            self._rosters_stale = False
+            for team in self.teams:
+                team.division_name = self.settings.division_map.get(team.division_id, '')
+        else:
+            self._fetch_teams(data, pro_schedule)
 
     def refresh_draft(self, refresh_players=False, refresh__teams=False):
         super()._fetch_draft()
         if refresh_players:
             self._fetch_players()
         if refresh__teams:
-            self._fetch_teams(data)
+            self.refresh()
     
     def load_roster_week(self, week: int) -> None:
         '''Sets Teams Roster for a Certain Week'''
@@ -98,7 +191,9 @@ class League(BaseLeague):
             'scoringPeriodId': week
         }
         data = self.espn_request.league_get(params=params)
+        self._set_roster_week(data)
 
+    def _set_roster_week(self, data) -> None:
         team_roster = {}
         for team in data['teams']:
             team_roster[team['id']] = team['roster']
@@ -106,6 +201,9 @@ class League(BaseLeague):
         for team in self.teams:
             roster = team_roster[team.team_id]
             team._fetch_roster(roster, self.year)
+        self._build_indexes()
+        # rosters no longer match the league view, the next refresh has to apply it even if it is unchanged
+        self._rosters_stale = True
 
     def standings(self) -> List[Team]:
         standings = sorted(self.teams, key=lambda x: x.final_standing if x.final_standing != 0 else x.standing, reverse=False)
@@ -245,40 +343,66 @@ class League(BaseLeague):
         if self.year < 2019:
             raise Exception('Cant use recent activity before 2019')
 
-        msg_types = [178,180,179,239,181,244]
-        if msg_type in ACTIVITY_MAP:
-            msg_types = [ACTIVITY_MAP[msg_type]]
-        params = {
-            'view': 'kona_league_communication'
-        }
-
-        filters = {"topics":{"filterType":{"value":["ACTIVITY_TRANSACTIONS"]},"limit":size,"limitPerMessageSet":{"value":25},"offset":offset,"sortMessageDate":{"sortPriority":1,"sortAsc":False},"sortFor":{"sortPriority":2,"sortAsc":False},"filterIncludeMessageTypeIds":{"value":msg_types}}}
-        headers = {'x-fantasy-filter': json.dumps(filters)}
-        data = self.espn_request.league_get(extend='/communication/', params=params, headers=headers)
+        data = self.espn_request.get_recent_activity(size, self._activity_msg_types(msg_type), offset)
         data = data['topics']
-        activity = [Activity(topic, self.player_map, self.get_team_data, self.player_info) for topic in data]
+        # resolve every player missing from a roster in one batch instead of a request per message
+        players = self.player_resolver.resolve(self._unrostered_activity_players(data))
+        activity = [Activity(topic, self.player_map, self.get_team_data, self._resolved_player_info(players)) for topic in data]
 
         return activity
 
+    @staticmethod
+    def _resolved_player_info(players: Dict[int, Player]) -> Callable:
+        '''player_info stand in for Activity that only looks at already resolved players'''
+        def player_info(playerId: int = None):
+            return players.get(playerId)
+        return player_info
+
+    def _unrostered_activity_players(self, topics) -> List[int]:
+        '''Returns activity player ids that are not on the roster of the team in the message'''
+        player_ids = []
+        for topic in topics:
+            for msg in topic['messages']:
+                team = self.get_team_data(Activity._get_team_id(msg))
+                on_roster = team and team.get_player(msg['targetId'])
+                if not on_roster and msg['targetId'] not in player_ids:
+                    player_ids.append(msg['targetId'])
+        return player_ids
+
+    def _activity_msg_types(self, msg_type: str = None) -> List[int]:
+        msg_types = [178,180,179,239,181,244]
+        if msg_type in ACTIVITY_MAP:
+            msg_types = [ACTIVITY_MAP[msg_type]]
+        return msg_types
+
     def scoreboard(self, week: int = None) -> List[Matchup]:
         '''Returns list of matchups for a given week'''
         if not week:
             week = self.current_week
 
-        params = {
-            'view': 'mMatchupScore',
-        }
-        data = self.espn_request.league_get(params=params)
+        # ESPN only sends the requested week, it is still filtered here in case the filter is ignored
+        data = self.espn_request.get_matchup_scores([week])
+        return self._build_scoreboard(data['schedule'], week)
 
-        schedule = data['schedule']
+    def scoreboard_range(self, start: int = 1, end: int = None) -> Dict[int, List[Matchup]]:
+        '''Returns matchups by week for every week from start to end with a single request'''
+        if not end:
+            end = self.current_week
+        weeks = list(range(start, end + 1))
+
+        data = self.espn_request.get_matchup_scores(weeks)
+        return {week: self._build_scoreboard(data['schedule'], week) for week in weeks}
+
+    def _build_scoreboard(self, schedule, week: int) -> List[Matchup]:
         matchups = [Matchup(matchup) for matchup in schedule if matchup['matchupPeriodId'] == week]
 
-        for team in self.teams:
-            for matchup in matchups:
-                if matchup._home_team_id == team.team_id:
-                    matchup.home_team = team
-                elif matchup._away_team_id == team.team_id:
-                    matchup.away_team = team
+        for matchup in matchups:
+            home_team = self.get_team_data(matchup._home_team_id)
+            away_team = self.get_team_data(matchup._away_team_id)
+            if home_team:
+                matchup.home_team = home_team
+            if away_team and away_team is not home_team:
+                matchup.away_team = away_team
 
         return matchups
 
@@ -287,6 +411,45 @@ class League(BaseLeague):
         Should only be used with most recent season'''
         if self.year < 2019:
             raise Exception('Cant use box score before 2019')
+        (scoring_period, matchup_period) = self._box_score_periods(week)
+
+        data = self.espn_request.get_box_scores(scoring_period, matchup_period)
+        pro_schedule = self._get_pro_schedule(scoring_period)
+        positional_rankings = self._get_positional_ratings(scoring_period)
+        return self._build_box_scores(data, pro_schedule, positional_rankings, scoring_period)
+
+    def box_scores_range(self, start: int = 1, end: int = None, max_workers: int = 4) -> Iterator[Tuple[int, List[BoxScore]]]:
+        '''Yields (week, list of box scores) for every week from start to end as each one arrives
+
+        Weeks are requested concurrently and share the pro schedule and positional ratings'''
+        if self.year < 2019:
+            raise Exception('Cant use box score before 2019')
+        weeks = self._box_score_range_periods(start, end)
+        pro_schedule = self._load_pro_schedule()
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        (ratings, box_scores) = ({}, {})
+        try:
+            # weeks past the current one map to the same scoring period so ratings are requested once per period
+            ratings = {scoring_period: executor.submit(self._get_positional_ratings, scoring_period) for (scoring_period, _) in set(weeks.values())}
+            box_scores = {executor.submit(self.espn_request.get_box_scores, *periods): week for (week, periods) in weeks.items()}
+            for future in as_completed(box_scores):
+                week = box_scores[future]
+                scoring_period = weeks[week][0]
+                yield (week, self._build_box_scores(future.result(), pro_schedule.week(scoring_period), ratings[scoring_period].result(), scoring_period))
+        finally:
+            # a consumer that stops early does not wait on the weeks it will never read
+            for future in list(ratings.values()) + list(box_scores):
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _box_score_range_periods(self, start: int = 1, end: int = None) -> Dict[int, Tuple[int, int]]:
+        '''Maps each week from start to end, the current week by default, to its (scoring period, matchup period)'''
+        end = end or self.current_week
+        return {week: self._box_score_periods(week) for week in range(start, end + 1)}
+
+    def _box_score_periods(self, week: int = None) -> Tuple[int, int]:
+        '''Returns the (scoring period, matchup period) a box score week maps to'''
         matchup_period = self.currentMatchupPeriod
         scoring_period = self.current_week
         if week and week <= self.current_week:
@@ -295,27 +458,19 @@ class League(BaseLeague):
               if week in self.settings.matchup_periods[matchup_id]:
                 matchup_period = matchup_id
                 break
+        return (scoring_period, matchup_period)
 
-        params = {
-            'view': ['mMatchupScore', 'mScoreboard'],
-            'scoringPeriodId': scoring_period,
-        }
-
-        filters = {"schedule":{"filterMatchupPeriodIds":{"value":[matchup_period]}}}
-        headers = {'x-fantasy-filter': json.dumps(filters)}
-        data = self.espn_request.league_get(params=params, headers=headers)
-
+    def _build_box_scores(self, data, pro_schedule, positional_rankings, scoring_period: int) -> List[BoxScore]:
         schedule = data['schedule']
-        pro_schedule = self._get_pro_schedule(scoring_period)
-        positional_rankings = self._get_positional_ratings(scoring_period)
         box_data = [BoxScore(matchup, pro_schedule, positional_rankings, scoring_period, self.year) for matchup in schedule]
 
-        for team in self.teams:
-            for matchup in box_data:
-                if matchup.home_team == team.team_id:
-                    matchup.home_team = team
-                elif matchup.away_team == team.team_id:
-                    matchup.away_team = team
+        for matchup in box_data:
+            home_team = self.get_team_data(matchup.home_team)
+            away_team = self.get_team_data(matchup.away_team)
+            if home_team:
+                matchup.home_team = home_team
+            if away_team and away_team is not home_team:
+                matchup.away_team = away_team
         return box_data
 
     def power_rankings(self, week: int=None):
@@ -348,40 +503,59 @@ class League(BaseLeague):
         if not week:
             week = self.current_week
 
+        data = self.espn_request.get_free_agents(week, size, self._free_agent_slot_filter(position, position_id))
+        pro_schedule = self._get_pro_schedule(week)
+        positional_rankings = self._get_positional_ratings(week)
+
+        return [BoxPlayer(player, pro_schedule, positional_rankings, week, self.year) for player in data['players']]
+
+    def _free_agent_slot_filter(self, position: str = None, position_id: int = None) -> List[int]:
         slot_filter = []
         if position and position in POSITION_MAP:
             slot_filter = [POSITION_MAP[position]]
         if position_id:
             slot_filter.append(position_id)
+        return slot_filter
 
+    def player_info(self, name: str = None, playerId: Union[int, list] = None, all_matches: bool = False) -> Union[Player, List[Player]]:
+        ''' Returns Player class if name found, a list of Players when given a list of ids
 
-        params = {
-            'view': 'kona_player_info',
-            'scoringPeriodId': week,
-        }
-        filters = {"players":{"filterStatus":{"value":["FREEAGENT","WAIVERS"]},"filterSlotIds":{"value":slot_filter},"limit":size,"sortPercOwned":{"sortPriority":1,"sortAsc":False},"sortDraftRanks":{"sortPriority":100,"sortAsc":True,"value":"STANDARD"}}}
-        headers = {'x-fantasy-filter': json.dumps(filters)}
-
-        data = self.espn_request.league_get(params=params, headers=headers)
-
-        players = data['players']
-        pro_schedule = self._get_pro_schedule(week)
-        positional_rankings = self._get_positional_ratings(week)
-
-        return [BoxPlayer(player, pro_schedule, positional_rankings, week, self.year) for player in players]
+        Players sharing a name are all returned as a list with all_matches, otherwise the first one'''
+        playerId = self._player_info_ids(name, playerId, all_matches)
+        if playerId is None:
+            return None
 
-    def player_info(self, name: str = None, playerId: Union[int, list] = None) -> Union[Player, List[Player]]:
-        ''' Returns Player class if name found '''
+        data = {'players': self._fetch_player_cards(playerId)}
+        pro_schedule = self._get_all_pro_schedule()
+        return self._build_player_info(data, pro_schedule, bool(name) and all_matches)
+
+    def _fetch_player_cards(self, playerIds: List[int]) -> List[dict]:
+        '''Player cards of every id, long id lists are split in header safe chunks requested concurrently'''
+        chunks = chunk_player_ids(playerIds)
+        if len(chunks) <= 1:
+            return self.espn_request.get_player_card(playerIds, self.finalScoringPeriod)['players']
+        with ThreadPoolExecutor(max_workers=min(4, len(chunks))) as executor:
+            results = executor.map(lambda chunk: self.espn_request.get_player_card(chunk, self.finalScoringPeriod), chunks)
+            return [player for data in results for player in data['players']]
+
+    def _fetch_players_by_id(self, playerIds: List[int]) -> List[Player]:
+        pro_schedule = self._get_all_pro_schedule()
+        return [Player(player, self.year, pro_schedule) for player in self._fetch_player_cards(playerIds)]
 
+    def _player_info_ids(self, name: str = None, playerId: Union[int, list] = None, all_matches: bool = False) -> List[int]:
         if name:
-            playerId = self.player_map.get(name)
+            playerId = self.player_directory.ids(name)
+            # the first player with the name unless every match is asked for
+            playerId = (playerId if all_matches else playerId[:1]) or None
         if playerId is None or isinstance(playerId, str):
             return None
         if not isinstance(playerId, list):
             playerId = [playerId]
+        return playerId
 
-        data = self.espn_request.get_player_card(playerId, self.finalScoringPeriod)
-        pro_schedule = self._get_all_pro_schedule()
+    def _build_player_info(self, data, pro_schedule, as_list: bool = False) -> Union[Player, List[Player]]:
+        if as_list:
+            return [Player(player, self.year, pro_schedule) for player in data['players']]
         if len(data['players']) == 1:
             return Player(data['players'][0], self.year, pro_schedule)
         if len(data['players']) > 1:
@@ -390,7 +564,9 @@ class League(BaseLeague):
     def message_board(self, msg_types: List[str] = None):
         ''' Returns a list of league messages'''
         data = self.espn_request.get_league_message_board(msg_types)
+        return self._parse_message_board(data)
 
+    def _parse_message_board(self, data) -> List[dict]:
         msg_topics = list(data.get('topicsByType', {}).keys())
         messages = []
         for topic in msg_topics:
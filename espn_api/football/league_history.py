@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List
+
+from .league import League
+from .team import Team
+
+OUTCOMES = {'W': 'wins', 'L': 'losses', 'T': 'ties'}
+
+
+def _head_to_head_record() -> Dict:
+    return {'games': 0, 'wins': 0, 'losses': 0, 'ties': 0, 'points_for': 0, 'points_against': 0}
+
+
+class LeagueHistory(object):
+    '''Every season of a league with records across seasons
+
+    The current season is loaded first to learn its previousSeasons, then the
+    past seasons are loaded at the same time on a thread pool. Seasons before
+    2018 come from the leagueHistory endpoint like any League of those years.
+    Leagues of one year share the player directory and pro schedule of the
+    process, kwargs (espn_s2, swid, transport, cache, metrics...) are passed to
+    every League. A season that fails to load is kept in errors instead of
+    stopping the others. When the current season fails its previousSeasons
+    are unknown, pass years to load the past seasons anyway.
+    '''
+    def __init__(self, league_id: int, year: int, years: Iterable[int] = None, max_workers: int = 4, fetch: bool = True, **kwargs):
+        self.league_id = league_id
+        self.year = year
+        self.max_workers = max_workers
+        self.kwargs = kwargs
+        self.leagues = {}
+        self.errors = {}
+        if fetch:
+            self.fetch(years)
+
+    def __repr__(self):
+        return 'LeagueHistory(%s, %s)' % (self.league_id, list(self.leagues), )
+
+    def __getitem__(self, year: int) -> League:
+        return self.leagues[year]
+
+    def __iter__(self) -> Iterator[League]:
+        return iter(self.leagues.values())
+
+    def __len__(self):
+        return len(self.leagues)
+
+    def fetch(self, years: Iterable[int] = None) -> None:
+        '''Loads the given seasons, by default this season and all of its previousSeasons'''
+        leagues = {}
+        self.errors = {}
+        if years is None:
+            try:
+                current = League(self.league_id, self.year, **self.kwargs)
+            except Exception as e:
+                self.errors[self.year] = e
+                years = []
+            else:
+                leagues[self.year] = current
+                years = current.previousSeasons
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(League, self.league_id, year, **self.kwargs): year for year in set(years) if year not in leagues}
+            for future in as_completed(futures):
+                year = futures[future]
+                try:
+                    leagues[year] = future.result()
+                except Exception as e:
+                    self.errors[year] = e
+        self.leagues = dict(sorted(leagues.items()))
+
+    def owners(self) -> Dict[str, str]:
+        '''member id -> display name as of the latest season the member played'''
+        owners = {}
+        for league in self:
+            for member in league.members:
+                owners[member.get('id')] = member.get('displayName') or f"{member.get('firstName', '')} {member.get('lastName', '')}".strip()
+        return owners
+
+    def _owner_id(self, owner: str) -> str:
+        '''Accepts a member id, display name or first and last name'''
+        owners = self.owners()
+        if owner in owners:
+            return owner
+        for league in self:
+            for member in league.members:
+                if owner in (member.get('displayName'), f"{member.get('firstName', '')} {member.get('lastName', '')}".strip()):
+                    return member.get('id')
+        raise Exception(f'Unknown owner: {owner}')
+
+    @staticmethod
+    def _owner_ids(team: Team) -> List[str]:
+        return [owner.get('id') for owner in team.owners]
+
+    def all_time_records(self) -> List[Dict]:
+        '''Regular season record, points and titles of every owner over all loaded seasons, most wins first'''
+        names = self.owners()
+        records = {}
+        for league in self:
+            for team in league.teams:
+                for owner in self._owner_ids(team):
+                    record = records.get(owner)
+                    if record is None:
+                        record = records[owner] = {'owner': owner, 'name': names.get(owner), 'seasons': [], 'wins': 0, 'losses': 0,
+                                                   'ties': 0, 'points_for': 0, 'points_against': 0, 'championships': 0}
+                    record['seasons'].append(league.year)
+                    record['wins'] += team.wins
+                    record['losses'] += team.losses
+                    record['ties'] += team.ties
+                    record['points_for'] += team.points_for
+                    record['points_against'] += team.points_against
+                    record['championships'] += team.final_standing == 1
+        for record in records.values():
+            record['points_for'] = round(record['points_for'], 2)
+            record['points_against'] = round(record['points_against'], 2)
+        return sorted(records.values(), key=lambda x: (x['wins'], x['points_for']), reverse=True)
+
+    def head_to_head(self, owner: str, opponent: str = None) -> Dict:
+        '''Decided games between two owners over all loaded seasons, playoffs included
+
+        Without an opponent returns {opponent member id: record} for every owner faced.
+        '''
+        owner = self._owner_id(owner)
+        records = {}
+        for league in self:
+            for team in league.teams:
+                if owner not in self._owner_ids(team):
+                    continue
+                for (week, other) in enumerate(team.schedule):
+                    # byes play the team itself, unknown opponents are left as ids
+                    if other is team or not isinstance(other, Team) or team.outcomes[week] not in OUTCOMES:
+                        continue
+                    for other_owner in self._owner_ids(other):
+                        record = records.setdefault(other_owner, _head_to_head_record())
+                        record['games'] += 1
+                        record[OUTCOMES[team.outcomes[week]]] += 1
+                        record['points_for'] = round(record['points_for'] + team.scores[week], 2)
+                        record['points_against'] = round(record['points_against'] + team.scores[week] - team.mov[week], 2)
+        if opponent is None:
+            return records
+        return records.get(self._owner_id(opponent), _head_to_head_record())
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+from ..requests.retry import RateLimiter
+from ..requests.transport import DEFAULT_BURST, DEFAULT_RATE, Transport
+from .league import League
+
+
+class LeagueManager(object):
+    '''Loads and refreshes many leagues through a bounded thread pool
+
+    leagues are (league_id, year) or (league_id, year, cookies) tuples with
+    cookies as {'espn_s2': ..., 'SWID': ...} for private leagues. Every League
+    uses one pooled and rate limited Transport, leagues of the same year share the player
+    directory and pro schedule of the process so each is downloaded once.
+    kwargs (cache, metrics, debug, log_body_limit...) are passed to every League. A league that
+    fails is reported in the returned failures and in errors, the rest of the
+    batch goes on.
+    '''
+    def __init__(self, leagues: Iterable[Tuple] = (), max_workers: int = 8, transport: Transport = None, **kwargs):
+        self.max_workers = max_workers
+        # one connection per worker stays alive between requests
+        self.transport = transport or Transport(pool_maxsize=max(10, max_workers), rate_limit=RateLimiter(DEFAULT_RATE, DEFAULT_BURST))
+        self.kwargs = kwargs
+        self.cookies = {}
+        self.leagues = {}
+        self.errors = {}
+        for league in leagues:
+            self.add(*league)
+
+    def __repr__(self):
+        return 'LeagueManager(%s leagues, %s loaded, %s failed)' % (len(self.cookies), len(self.leagues), len(self.errors), )
+
+    def __getitem__(self, key: Tuple[int, int]) -> League:
+        return self.leagues[key]
+
+    def __iter__(self) -> Iterator[League]:
+        return iter(self.leagues.values())
+
+    def __len__(self):
+        return len(self.leagues)
+
+    def add(self, league_id: int, year: int, cookies: dict = None) -> None:
+        self.cookies[(league_id, year)] = cookies or {}
+
+    def remove(self, league_id: int, year: int) -> None:
+        key = (league_id, year)
+        self.cookies.pop(key, None)
+        self.leagues.pop(key, None)
+        self.errors.pop(key, None)
+
+    def load(self) -> Dict[Tuple[int, int], Exception]:
+        '''Builds every league not loaded yet, returns {(league_id, year): error} of the ones that failed'''
+        return self._run(self._load, [key for key in self.cookies if key not in self.leagues])
+
+    def refresh(self) -> Dict[Tuple[int, int], Exception]:
+        '''Refreshes the loaded leagues and loads the ones that are not, returns the failures'''
+        return self._run(self._refresh, list(self.cookies))
+
+    def _load(self, key: Tuple[int, int]) -> League:
+        (league_id, year) = key
+        cookies = self.cookies[key]
+        return League(league_id, year, espn_s2=cookies.get('espn_s2'), swid=cookies.get('SWID'), transport=self.transport, **self.kwargs)
+
+    def _refresh(self, key: Tuple[int, int]) -> League:
+        league = self.leagues.get(key)
+        if league is None:
+            return self._load(key)
+        league.refresh()
+        return league
+
+    def _run(self, task: Callable[[Tuple[int, int]], League], keys) -> Dict[Tuple[int, int], Exception]:
+        failures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(task, key): key for key in keys}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    self.leagues[key] = future.result()
+                    self.errors.pop(key, None)
+                except Exception as e:
+                    failures[key] = self.errors[key] = e
+        return failures
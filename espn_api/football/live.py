@@ -0,0 +1,181 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, Dict, List, Tuple
+
+from ..requests.async_requests import get_default_executor
+from .team import Team
+
+
+class LiveEvent(object):
+    '''Change seen between two polls of a LiveScoreboard'''
+    __slots__ = ('matchup_id', 'week')
+
+    def __init__(self, matchup_id: int, week: int):
+        self.matchup_id = matchup_id
+        self.week = week
+
+
+class PlayerPointsChanged(LiveEvent):
+    __slots__ = ('team', 'team_id', 'player_id', 'player_name', 'old_points', 'points')
+
+    def __init__(self, matchup_id: int, week: int, team: Team, team_id: int, player_id: int, player_name: str, old_points: float, points: float):
+        super().__init__(matchup_id, week)
+        self.team = team
+        self.team_id = team_id
+        self.player_id = player_id
+        self.player_name = player_name
+        self.old_points = old_points
+        self.points = points
+
+    def __repr__(self):
+        return f'PlayerPointsChanged({self.player_name}, {self.old_points} -> {self.points})'
+
+
+class TeamScoreChanged(LiveEvent):
+    __slots__ = ('team', 'team_id', 'old_score', 'score', 'projected')
+
+    def __init__(self, matchup_id: int, week: int, team: Team, team_id: int, old_score: float, score: float, projected: float):
+        super().__init__(matchup_id, week)
+        self.team = team
+        self.team_id = team_id
+        self.old_score = old_score
+        self.score = score
+        self.projected = projected
+
+    def __repr__(self):
+        return f'TeamScoreChanged({self.team or self.team_id}, {self.old_score} -> {self.score})'
+
+
+class MatchupDecided(LiveEvent):
+    __slots__ = ('winner', 'home_team', 'away_team', 'home_score', 'away_score')
+
+    def __init__(self, matchup_id: int, week: int, winner: str, home_team: Team, away_team: Team, home_score: float, away_score: float):
+        super().__init__(matchup_id, week)
+        self.winner = winner
+        self.home_team = home_team
+        self.away_team = away_team
+        self.home_score = home_score
+        self.away_score = away_score
+
+    def __repr__(self):
+        return f'MatchupDecided({self.home_team} {self.home_score} - {self.away_score} {self.away_team}, {self.winner})'
+
+
+class LiveScoreboard(object):
+    '''Polls the box scores of a week and reports what changed as LiveEvents
+
+    Only team scores, the winner and each rostered players points are read
+    from the response, no BoxScore or BoxPlayer is built. The first poll sets
+    the baseline and returns no events. Events go to subscribed callbacks, to
+    the list returned by poll() and to `async for event in scoreboard`.
+    '''
+    def __init__(self, league, week: int = None, interval: float = 30):
+        self.league = league
+        self.interval = interval
+        (self.scoring_period, self.matchup_period) = league._box_score_periods(week)
+        self._data = None
+        self._snapshot = None
+        self._callbacks = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __repr__(self):
+        return 'LiveScoreboard(%s, week %s)' % (self.league, self.scoring_period, )
+
+    def subscribe(self, callback: Callable[[LiveEvent], None]) -> None:
+        self._callbacks.append(callback)
+
+    def poll(self) -> List[LiveEvent]:
+        '''Fetches the box scores once and returns the events since the last poll'''
+        data = self.league.espn_request.get_box_scores(self.scoring_period, self.matchup_period, conditional=True)
+        # a 304 Not Modified returns the same object, nothing to parse
+        if data is self._data:
+            return []
+        self._data = data
+        snapshot = self._parse(data)
+        events = [] if self._snapshot is None else self._diff(self._snapshot, snapshot)
+        self._snapshot = snapshot
+        for event in events:
+            for callback in self._callbacks:
+                callback(event)
+        return events
+
+    def _parse(self, data) -> Dict[int, Tuple]:
+        '''matchup id -> (winner, {side: (team id, score, projected, {player id: (name, points)})})'''
+        snapshot = {}
+        for matchup in data.get('schedule', []):
+            sides = {}
+            for side in ('home', 'away'):
+                if side not in matchup:
+                    continue
+                team = matchup[side]
+                score = round(team.get('totalPointsLive', team.get('totalPoints', 0)), 2)
+                projected = round(team.get('totalProjectedPointsLive', -1), 2)
+                players = {}
+                for entry in team.get('rosterForCurrentScoringPeriod', {}).get('entries', []):
+                    player = entry['playerPoolEntry']['player']
+                    players[player['id']] = (player.get('fullName'), self._points(player))
+                sides[side] = (team['teamId'], score, projected, players)
+            snapshot[matchup.get('id')] = (matchup.get('winner', 'UNDECIDED'), sides)
+        return snapshot
+
+    def _points(self, player) -> float:
+        for stats in player.get('stats', []):
+            if stats.get('scoringPeriodId') == self.scoring_period and stats.get('statSourceId') == 0:
+                return round(stats.get('appliedTotal', 0), 2)
+        return 0
+
+    def _diff(self, previous: Dict[int, Tuple], current: Dict[int, Tuple]) -> List[LiveEvent]:
+        events = []
+        week = self.scoring_period
+        for (matchup_id, (winner, sides)) in current.items():
+            (old_winner, old_sides) = previous.get(matchup_id, ('UNDECIDED', {}))
+            for (side, (team_id, score, projected, players)) in sides.items():
+                team = self.league.get_team_data(team_id)
+                (_, old_score, _, old_players) = old_sides.get(side, (team_id, 0, -1, {}))
+                for (player_id, (name, points)) in players.items():
+                    old_points = old_players.get(player_id, (name, 0))[1]
+                    if points != old_points:
+                        events.append(PlayerPointsChanged(matchup_id, week, team, team_id, player_id, name, old_points, points))
+                if score != old_score:
+                    events.append(TeamScoreChanged(matchup_id, week, team, team_id, old_score, score, projected))
+            if winner != old_winner and old_winner == 'UNDECIDED':
+                (home, away) = (sides.get('home', (0, 0)), sides.get('away', (0, 0)))
+                events.append(MatchupDecided(matchup_id, week, winner, self.league.get_team_data(home[0]), self.league.get_team_data(away[0]), home[1], away[1]))
+        return events
+
+    def run(self) -> None:
+        '''Polls every interval seconds until stop() is called, errors are logged and polling goes on'''
+        self._stop.clear()
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                self.league.logger.logging.warning(f'LiveScoreboard poll failed: {e}')
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        '''Polls on a background thread, events are delivered to the subscribed callbacks'''
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name=repr(self), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    async def __aiter__(self) -> AsyncIterator[LiveEvent]:
+        '''Yields events as polls find them until stop() is called'''
+        loop = asyncio.get_running_loop()
+        # polls share the bounded pool of the league instead of the loops default executor
+        async_request = getattr(self.league, 'async_request', None)
+        executor = async_request.executor if async_request else get_default_executor()
+        self._stop.clear()
+        while not self._stop.is_set():
+            for event in await loop.run_in_executor(executor, self.poll):
+                yield event
+            await asyncio.sleep(self.interval)
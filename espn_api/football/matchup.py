@@ -1,9 +1,12 @@
 from .team import Team
+from .utils import intern_str
 
 class Matchup(object):
     '''Creates Matchup instance'''
+    __slots__ = ('matchup_type', 'is_playoff', '_home_team_id', 'home_score', '_away_team_id', 'away_score', 'home_team', 'away_team')
+
     def __init__(self, data):
-        self.matchup_type = data.get('playoffTierType', 'NONE')
+        self.matchup_type = intern_str(data.get('playoffTierType', 'NONE'))
         self.is_playoff = self.matchup_type != 'NONE'
         (self._home_team_id, self.home_score) = self._fetch_matchup_info(data, 'home')
         (self._away_team_id, self.away_score) = self._fetch_matchup_info(data, 'away')
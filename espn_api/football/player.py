@@ -1,70 +1,106 @@
 from .constant import POSITION_MAP, PRO_TEAM_MAP, PLAYER_STATS_MAP
-from .utils import json_parsing
+from .utils import json_parsing_keys, intern_str
+from .pro_schedule import ProSchedule
 from datetime import datetime
 
+PLAYER_KEYS = ('fullName', 'id', 'positionalRanking', 'eligibleSlots', 'acquisitionType', 'proTeamId', 'injuryStatus', 'onTeamId')
+
 class Player(object):
     '''Player are part of team'''
+    __slots__ = ('name', 'playerId', 'posRank', 'eligibleSlots', 'acquisitionType', 'proTeam', 'injuryStatus', 'onTeamId',
+                 'lineupSlot', 'schedule', 'position', 'injured', 'percent_owned', 'percent_started', 'active_status',
+                 'total_points', 'projected_total_points', 'avg_points', 'projected_avg_points', '_stats', '_raw_stats')
+
     def __init__(self, data, year, pro_team_schedule = None):
-        self.name = json_parsing(data, 'fullName')
-        self.playerId = json_parsing(data, 'id')
-        self.posRank = json_parsing(data, 'positionalRanking')
-        self.eligibleSlots = [POSITION_MAP[pos] for pos in json_parsing(data, 'eligibleSlots')]
-        self.acquisitionType = json_parsing(data, 'acquisitionType')
-        self.proTeam = PRO_TEAM_MAP[json_parsing(data, 'proTeamId')]
-        self.injuryStatus = json_parsing(data, 'injuryStatus')
-        self.onTeamId = json_parsing(data, 'onTeamId')
+        values = json_parsing_keys(data, PLAYER_KEYS)
+        self.name = values['fullName']
+        self.playerId = values['id']
+        self.posRank = values['positionalRanking']
+        self.eligibleSlots = [POSITION_MAP[pos] for pos in values['eligibleSlots']]
+        self.acquisitionType = intern_str(values['acquisitionType'])
+        self.proTeam = PRO_TEAM_MAP[values['proTeamId']]
+        self.injuryStatus = intern_str(values['injuryStatus'])
+        self.onTeamId = values['onTeamId']
         self.lineupSlot = POSITION_MAP.get(data.get('lineupSlotId'), '')
-        self.stats = {}
         self.schedule = {}
 
         # Get players main position
-        for pos in json_parsing(data, 'eligibleSlots'):
+        for pos in values['eligibleSlots']:
             if (pos != 25 and '/' not in POSITION_MAP[pos]) or '/' in self.name:
                 self.position = POSITION_MAP[pos]
                 break
 
-        if pro_team_schedule:
-            pro_team_id = json_parsing(data, 'proTeamId')
+        if isinstance(pro_team_schedule, ProSchedule):
+            # a view into the shared season index instead of a copy of every game
+            self.schedule = pro_team_schedule.view(values['proTeamId'])
+        elif pro_team_schedule:
+            pro_team_id = values['proTeamId']
             pro_team = pro_team_schedule.get(pro_team_id, {})
             for key in pro_team:
                 game = pro_team[key][0]
                 team = game['awayProTeamId'] if game['awayProTeamId'] != pro_team_id else game['homeProTeamId']
                 self.schedule[key] = { 'team': PRO_TEAM_MAP[team], 'date': datetime.fromtimestamp(game['date']/1000.0) }
 
-        # set each scoring period stat
+        self._update(data, year)
+
+    def _update(self, data, year):
+        '''Sets injury, ownership, stats and points, the parts of a player that change during the season'''
         player = data['playerPoolEntry']['player'] if 'playerPoolEntry' in data else data['player']
-        self.injuryStatus = player.get('injuryStatus', self.injuryStatus)
+        self.injuryStatus = intern_str(player.get('injuryStatus', data.get('injuryStatus', self.injuryStatus)))
         self.injured = player.get('injured', False)
         self.percent_owned = round(player.get('ownership', {}).get('percentOwned', -1), 2)
         self.percent_started = round(player.get('ownership', {}).get('percentStarted', -1), 2)
 
+        # set each scoring period stat, kept raw per scoring period and only translated when asked for
         self.active_status = 'bye'
+        self._stats = None
+        self._raw_stats = {}
         player_stats = player.get('stats', [])
         for stats in player_stats:
             if stats.get('seasonId') != year or stats.get('statSplitTypeId') == 2:
                 continue
             stats_breakdown = stats.get('stats') or stats.get('appliedStats', {})
-            breakdown = {PLAYER_STATS_MAP.get(int(k), k):v for (k,v) in stats_breakdown.items()}
-            points = round(stats.get('appliedTotal', 0), 2)
-            avg_points =  round(stats.get('appliedAverage', 0), 2)
-            scoring_period = stats.get('scoringPeriodId')
-            stat_source = stats.get('statSourceId')
-            (points_type, breakdown_type, avg_type) = ('points', 'breakdown', 'avg_points') if stat_source == 0 else ('projected_points', 'projected_breakdown', 'projected_avg_points')
-            if self.stats.get(scoring_period):
-                self.stats[scoring_period][points_type] = points
-                self.stats[scoring_period][breakdown_type] = breakdown
-                self.stats[scoring_period][avg_type] = avg_points
-            else:
-                self.stats[scoring_period] = {points_type: points, breakdown_type: breakdown, avg_type: avg_points}
-            if not stat_source:
-                if not self.stats[scoring_period][breakdown_type]:
+            # only what is needed to build the stats later, not the whole ESPN entry
+            entry = (stats.get('statSourceId'), stats.get('appliedTotal', 0), stats.get('appliedAverage', 0), stats_breakdown)
+            self._raw_stats.setdefault(stats.get('scoringPeriodId'), []).append(entry)
+            if not stats.get('statSourceId'):
+                if not stats_breakdown:
                     self.active_status = 'inactive'
                 else:
                     self.active_status = 'active'
-        self.total_points = self.stats.get(0, {}).get('points', 0)
-        self.projected_total_points = self.stats.get(0, {}).get('projected_points', 0)
-        self.avg_points = self.stats.get(0, {}).get('avg_points', 0)
-        self.projected_avg_points = self.stats.get(0, {}).get('projected_avg_points', 0)
+        season = self._decode_stats(0, breakdowns=False)
+        self.total_points = season.get('points', 0)
+        self.projected_total_points = season.get('projected_points', 0)
+        self.avg_points = season.get('avg_points', 0)
+        self.projected_avg_points = season.get('projected_avg_points', 0)
+
+    @property
+    def stats(self) -> dict:
+        '''Stats by scoring period, built from the raw ESPN stats on first access'''
+        if self._stats is None:
+            self._stats = {scoring_period: self._decode_stats(scoring_period) for scoring_period in self._raw_stats}
+            self._raw_stats = {}
+        return self._stats
+
+    @stats.setter
+    def stats(self, stats: dict):
+        self._stats = stats
+
+    def _get_scoring_period_stats(self, scoring_period: int) -> dict:
+        '''Stats for a single scoring period without building every other period'''
+        if self._stats is not None:
+            return self._stats.get(scoring_period, {})
+        return self._decode_stats(scoring_period)
+
+    def _decode_stats(self, scoring_period: int, breakdowns: bool = True) -> dict:
+        stats = {}
+        for (stat_source, points, avg_points, stats_breakdown) in self._raw_stats.get(scoring_period, []):
+            (points_type, breakdown_type, avg_type) = ('points', 'breakdown', 'avg_points') if stat_source == 0 else ('projected_points', 'projected_breakdown', 'projected_avg_points')
+            stats[points_type] = round(points, 2)
+            if breakdowns:
+                stats[breakdown_type] = {PLAYER_STATS_MAP.get(int(k), k):v for (k,v) in stats_breakdown.items()}
+            stats[avg_type] = round(avg_points, 2)
+        return stats
 
     def __repr__(self):
         return f'Player({self.name})'
@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ..requests.cache import VIEW_TTLS
+from .player import Player
+
+
+def chunk_player_ids(playerIds: Iterable[int], max_ids: int = 50, max_bytes: int = 2048) -> List[List[int]]:
+    '''Splits ids so each x-fantasy-filter header stays small enough for ESPN to accept'''
+    chunks = []
+    chunk = []
+    size = 0
+    for playerId in playerIds:
+        # digits plus the separating comma in the JSON list
+        id_size = len(str(playerId)) + 1
+        if chunk and (len(chunk) >= max_ids or size + id_size > max_bytes):
+            chunks.append(chunk)
+            (chunk, size) = ([], 0)
+        chunk.append(playerId)
+        size += id_size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class PlayerResolver(object):
+    '''Resolves player ids to Players in batches, remembering results for ttl seconds
+
+    fetch is given every id that is not cached in one call and returns the Players
+    it found, ids ESPN does not know are remembered as None.
+    '''
+    def __init__(self, fetch: Callable[[List[int]], List[Player]], ttl: Optional[float] = VIEW_TTLS['kona_playercard']):
+        self.fetch = fetch
+        self.ttl = ttl
+        self._players = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'PlayerResolver(%s cached)' % (len(self._players), )
+
+    def resolve(self, playerIds: Iterable[int]) -> Dict[int, Optional[Player]]:
+        now = time.time()
+        found = {}
+        missing = []
+        seen = set()
+        with self._lock:
+            for playerId in playerIds:
+                if playerId in seen:
+                    continue
+                seen.add(playerId)
+                cached = self._players.get(playerId)
+                if cached is not None and (self.ttl is None or now - cached[0] < self.ttl):
+                    found[playerId] = cached[1]
+                else:
+                    missing.append(playerId)
+        if not missing:
+            return found
+
+        players = {player.playerId: player for player in self.fetch(missing)}
+        with self._lock:
+            for playerId in missing:
+                found[playerId] = players.get(playerId)
+                self._players[playerId] = (now, found[playerId])
+        return found
+
+    def clear(self) -> None:
+        with self._lock:
+            self._players = {}
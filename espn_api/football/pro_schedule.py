@@ -0,0 +1,131 @@
+import threading
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from .constant import PRO_TEAM_MAP
+from ..requests.cache import VIEW_TTLS, current_season
+
+
+class ProTeamSchedule(Mapping):
+    '''Read only view of one pro team's games keyed by scoring period
+
+    Each game is built as {'team': opponent, 'date': kickoff} when looked up,
+    players of the same pro team share the underlying games of the ProSchedule.
+    '''
+    __slots__ = ('_games', )
+
+    def __init__(self, games: Dict[str, Tuple[int, int]]):
+        self._games = games
+
+    def __getitem__(self, scoring_period: str) -> dict:
+        (opponent, date) = self._games[scoring_period]
+        return {'team': PRO_TEAM_MAP[opponent], 'date': datetime.fromtimestamp(date/1000.0)}
+
+    def __iter__(self):
+        return iter(self._games)
+
+    def __len__(self):
+        return len(self._games)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class ProSchedule(object):
+    '''Season index of pro games, proTeamId x scoringPeriod -> (opponent proTeamId, kickoff in ms)
+
+    Built once from the proTeamSchedules_wl view and shared by every League
+    of the season through get_pro_schedule.
+    '''
+    def __init__(self, data: dict, fetched: float = None):
+        self.fetched = time.time() if fetched is None else fetched
+        self._games = {}
+        self._weeks = {}
+        for team in data.get('settings', {}).get('proTeams', []):
+            team_id = team['id']
+            games = {}
+            for (scoring_period, period_games) in team.get('proGamesByScoringPeriod', {}).items():
+                if not period_games:
+                    continue
+                game = period_games[0]
+                opponent = game['awayProTeamId'] if game['awayProTeamId'] != team_id else game['homeProTeamId']
+                games[scoring_period] = (opponent, game['date'])
+            self._games[team_id] = games
+
+    def __repr__(self):
+        return 'ProSchedule(%s teams)' % (len(self._games), )
+
+    @classmethod
+    def from_games(cls, games: Dict[str, Dict[str, list]], fetched: float) -> 'ProSchedule':
+        '''Rebuilds a schedule from the index returned by export_games'''
+        schedule = cls({}, fetched)
+        schedule._games = {int(team_id): {period: tuple(game) for (period, game) in team_games.items()} for (team_id, team_games) in games.items()}
+        return schedule
+
+    def export_games(self) -> Dict[str, Dict[str, Tuple[int, int]]]:
+        '''The index keyed by str(proTeamId) so it can be written as JSON'''
+        return {str(team_id): games for (team_id, games) in self._games.items()}
+
+    def games(self, pro_team_id: int) -> Dict[str, Tuple[int, int]]:
+        return self._games.get(pro_team_id, {})
+
+    def view(self, pro_team_id: int) -> ProTeamSchedule:
+        '''Schedule of a pro team as used by Player.schedule'''
+        return ProTeamSchedule(self.games(pro_team_id))
+
+    def week(self, scoring_period: int) -> Dict[int, Tuple[int, int]]:
+        '''Opponent and kickoff of every pro team playing in a scoring period, teams on bye are left out'''
+        week = self._weeks.get(scoring_period)
+        if week is None:
+            key = str(scoring_period)
+            week = {team_id: games[key] for (team_id, games) in self._games.items() if team_id != 0 and key in games}
+            self._weeks[scoring_period] = week
+        return week
+
+    def is_stale(self, year: int, max_age: Optional[float]) -> bool:
+        # kickoffs of a finished season do not move
+        if max_age is None or year < current_season():
+            return False
+        return time.time() - self.fetched >= max_age
+
+
+_schedules = {}
+_schedules_lock = threading.Lock()
+# one lock per season so different seasons download at the same time
+_year_locks = {}
+
+
+def get_pro_schedule(year: int, fetch: Callable[[], dict], max_age: Optional[float] = VIEW_TTLS['proTeamSchedules_wl']) -> ProSchedule:
+    '''Returns the process wide ProSchedule of a season, built with fetch when missing or stale'''
+    schedule = _schedules.get(year)
+    if schedule is not None and not schedule.is_stale(year, max_age):
+        return schedule
+    with _schedules_lock:
+        year_lock = _year_locks.setdefault(year, threading.Lock())
+    with year_lock:
+        schedule = _schedules.get(year)
+        if schedule is None or schedule.is_stale(year, max_age):
+            schedule = ProSchedule(fetch())
+            with _schedules_lock:
+                _schedules[year] = schedule
+        return schedule
+
+
+def restore_pro_schedule(year: int, schedule: ProSchedule) -> ProSchedule:
+    '''Shares a saved ProSchedule unless the process already holds a newer one, returns the one in use'''
+    with _schedules_lock:
+        current = _schedules.get(year)
+        if current is None or current.fetched < schedule.fetched:
+            current = _schedules[year] = schedule
+        return current
+
+
+def set_pro_schedule(year: int, schedule: Optional[ProSchedule]) -> None:
+    '''Replaces the shared ProSchedule of a season, None forces the next use to fetch it again'''
+    with _schedules_lock:
+        if schedule is None:
+            _schedules.pop(year, None)
+        else:
+            _schedules[year] = schedule
@@ -156,7 +156,7 @@ class GoogleSheetService:
 
     # GET weekly or RoS roster rankings from FantasyPros
     def get_fantasy_pros_rankings(self, uri):
-        data = requests.get(uri)
+        data = requests.get(uri, timeout=(5, 30))
         if not data.ok:
             print(f'An error occurred when fetching rankings from FantasyPros {uri}: ' + data.reason)
         else:
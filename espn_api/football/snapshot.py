@@ -0,0 +1,60 @@
+'''Saves the views a League was built from so it can be rebuilt without requests
+
+A snapshot is a JSON lines file, gzip compressed when the path ends in .gz.
+The first line describes the league, every other line holds one view:
+
+    {"snapshot":1,"sport":"nfl","league_id":123,"year":2018,"created":...}
+    {"view":"league","data":{...}}
+    {"view":"draft","data":{...}}
+    {"view":"pro_schedule","fetched":...,"games":{"1":{"1":[2,1536431400000]}}}
+    {"view":"players","fetched":...,"players":[[2576980,"Fozzy Whittaker"],...]}
+
+The league and draft are kept as ESPN sent them, the pro schedule and the
+player map as the parsed indexes so restoring them needs no parsing.
+Cookies are never written.
+'''
+import gzip
+import os
+import time
+from typing import Dict, Iterable, Iterator
+
+from ..utils import json_backend
+
+SNAPSHOT_VERSION = 1
+
+
+def _open(path: str, mode: str, compressed: bool):
+    if compressed:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write_snapshot(path: str, header: dict, views: Iterable[dict]) -> None:
+    '''Writes header and views to path, replacing an existing snapshot only once it is complete'''
+    tmp = path + '.tmp'
+    with _open(tmp, 'w', path.endswith('.gz')) as f:
+        f.write(json_backend.dumps(dict(header, snapshot=SNAPSHOT_VERSION, created=time.time())))
+        f.write('\n')
+        for view in views:
+            f.write(json_backend.dumps(view))
+            f.write('\n')
+    os.replace(tmp, path)
+
+
+def _lines(path: str) -> Iterator[dict]:
+    with _open(path, 'r', path.endswith('.gz')) as f:
+        for line in f:
+            if line.strip():
+                yield json_backend.loads(line)
+
+
+def read_snapshot(path: str) -> Dict[str, dict]:
+    '''Returns {'header': header, view name: view} of a snapshot'''
+    lines = _lines(path)
+    header = next(lines, None)
+    if not header or header.get('snapshot') != SNAPSHOT_VERSION:
+        raise ValueError(f'{path} is not a version {SNAPSHOT_VERSION} league snapshot')
+    snapshot = {'header': header}
+    for view in lines:
+        snapshot[view['view']] = view
+    return snapshot
@@ -1,9 +1,31 @@
 from .player import Player
+from .utils import intern_str
 
 class Team(object):
     '''Teams are part of the league'''
-    def __init__(self, data, roster, schedule, year, **kwargs):
+    __slots__ = ('team_id', 'team_abbrev', 'team_name', 'division_id', 'division_name', 'wins', 'losses', 'ties',
+                 'points_for', 'points_against', 'acquisitions', 'acquisition_budget_spent', 'drops', 'trades',
+                 'playoff_pct', 'draft_projected_rank', 'streak_length', 'streak_type', 'standing', 'final_standing',
+                 'waiver_rank', 'logo_url', 'roster', 'schedule', 'scores', 'outcomes', 'mov', 'owners', '_roster_index', '_roster_signature')
+
+    def __init__(self, data, roster, schedule = None, year = None, **kwargs):
+        # schedule, scores, outcomes and mov are filled in by the league in one pass over its schedule
         self.team_id = data['id']
+        self._update(data)
+        self.roster = []
+        self._roster_index = {}
+        self.schedule = []
+        self.scores = []
+        self.outcomes = []
+        self.mov = []
+        self._fetch_roster(roster, year, kwargs.get('pro_schedule'))
+        self.owners = kwargs.get('owners', [])
+
+    def __repr__(self):
+        return 'Team(%s)' % (self.team_name, )
+
+    def _update(self, data):
+        '''Sets name, record and standing, everything but the roster and schedule'''
         self.team_abbrev = data['abbrev']
         self.team_name = data.get('name', 'Unknown')
         if self.team_name == 'Unknown':
@@ -22,7 +44,7 @@ class Team(object):
         self.playoff_pct = data.get('currentSimulationResults', {}).get('playoffPct', 0) * 100
         self.draft_projected_rank = data.get('draftDayProjectedRank', 0)
         self.streak_length = data['record']['overall']['streakLength']
-        self.streak_type = data['record']['overall']['streakType']
+        self.streak_type = intern_str(data['record']['overall']['streakType'])
         self.standing = data['playoffSeed']
         self.final_standing = data['rankCalculatedFinal']
         self.waiver_rank = data.get('waiverRank', 0)
@@ -30,46 +52,29 @@ class Team(object):
             self.logo_url = data['logo']
         else:
             self.logo_url = ''
-        self.roster = []
-        self.schedule = []
-        self.scores = []
-        self.outcomes = []
-        self.mov = []
-        self._fetch_schedule(schedule)
-        self._fetch_roster(roster, year, kwargs.get('pro_schedule'))
-        self.owners = kwargs.get('owners', [])
 
-    def __repr__(self):
-        return 'Team(%s)' % (self.team_name, )
-    
+    @staticmethod
+    def _get_roster_signature(data) -> tuple:
+        '''Players and lineup slots of the roster, equal when nobody was added, dropped or moved'''
+        return tuple((entry.get('playerId'), entry.get('lineupSlotId')) for entry in data.get('entries', []))
+
     def _fetch_roster(self, data, year, pro_schedule = None):
         '''Fetch teams roster'''
         self.roster.clear()
+        self._roster_index = {}
+        self._roster_signature = self._get_roster_signature(data)
         roster = data.get('entries', [])
 
         for player in roster:
-            self.roster.append(Player(player, year, pro_schedule))
+            player = Player(player, year, pro_schedule)
+            self.roster.append(player)
+            self._roster_index[player.playerId] = player
 
-    def _fetch_schedule(self, data):
-        '''Fetch schedule and scores for team'''
+    def _update_roster(self, data, year):
+        '''Updates stats and injuries of the players of an unchanged roster in place'''
+        for entry in data.get('entries', []):
+            self._roster_index[entry['playerId']]._update(entry, year)
 
-        for matchup in data:
-            home_team = matchup.get('home', {})
-            away_team = matchup.get('away', {})
-            home_id = home_team.get('teamId', -1)
-            away_id = away_team.get('teamId', -1)
-
-            if self.team_id in (home_id, away_id):
-                # find if current team is home or away
-                (current_team, opponent_id, away) = (home_team, away_id, False) if home_id == self.team_id else (away_team, home_id, True)
-                # if bye week set opponent id to self
-                if opponent_id == -1: opponent_id = self.team_id
-
-                score = current_team.get('totalPoints')
-                self.outcomes.append(self._get_winner(matchup['winner'], away))
-                self.scores.append(score)
-                self.schedule.append(opponent_id)
-    
     def _get_winner(self, winner: str, is_away: bool) -> str:
         if winner == 'UNDECIDED':
             return 'U'
@@ -80,8 +85,9 @@ class Team(object):
         else:
             return 'L'
 
+    def get_player(self, playerId: int) -> Player:
+        return self._roster_index.get(playerId)
+
     def get_player_name(self, playerId: int) -> str:
-        for player in self.roster:
-            if player.playerId == playerId:
-                return player.name
-        return ''
+        player = self._roster_index.get(playerId)
+        return player.name if player else ''
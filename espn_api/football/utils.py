@@ -1,5 +1,14 @@
+import sys
+
 # Helper functions for json parsing and power rankings
 
+def intern_str(value):
+    """Interns strings so repeated values like statuses share one object.
+
+    Only for low cardinality fields, names are not worth a table entry each.
+    """
+    return sys.intern(value) if isinstance(value, str) else value
+
 def json_parsing(obj, key):
     """Recursively pull values of specified key from nested JSON."""
     arr = []
@@ -20,6 +29,35 @@ def json_parsing(obj, key):
     results = extract(obj, arr, key)
     return results[0] if results else results
 
+def json_parsing_keys(obj, keys):
+    """Pull the first value of each key from nested JSON in a single pass.
+
+    Matches json_parsing(obj, key) for every key, keys that are not found map to [].
+    """
+    found = {}
+    remaining = set(keys)
+
+    def extract(obj):
+        """Walk the object in order, returns True once every key is found."""
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                if isinstance(v, (dict)) or (isinstance(v, (list)) and  v and isinstance(v[0], (list, dict))):
+                    if extract(v):
+                        return True
+                elif k in remaining:
+                    found[k] = v
+                    remaining.discard(k)
+                    if not remaining:
+                        return True
+        elif isinstance(obj, list):
+            for item in obj:
+                if extract(item):
+                    return True
+        return False
+
+    extract(obj)
+    return {key: found.get(key, []) for key in keys}
+
 def square_matrix(X):
     '''Squares a matrix'''
     result = [[0.0 for x in range(len(X))] for y in range(len(X))]
@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from .requests.cache import VIEW_TTLS, current_season
+
+
+class PlayerDirectory(Mapping):
+    '''Two way playerId <-> fullName map of a sports professional players for one season
+
+    One directory per sport and year is shared by every League in the process
+    (see get_player_directory) so the player pool is downloaded and held once.
+    Looking up a name returns the first player with it, ids() returns all of them.
+    The current season is reloaded once it is older than max_age seconds, a path
+    keeps a copy on disk that new processes start from while it is fresh.
+    '''
+    def __init__(self, sport: str, year: int, path: str = None, max_age: Optional[float] = VIEW_TTLS['players_wl']):
+        self.sport = sport
+        self.year = year
+        self.path = path
+        self.max_age = max_age
+        self.fetched = None
+        self.players = 0
+        self._map = {}
+        # only names shared by more than one player, in the order ESPN lists them
+        self._duplicates = {}
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return 'PlayerDirectory(%s, %s, %s players)' % (self.sport, self.year, self.players, )
+
+    def __getitem__(self, key):
+        return self._map[key]
+
+    def __iter__(self):
+        return iter(self._map)
+
+    def __len__(self):
+        return len(self._map)
+
+    def ids(self, name: str) -> List[int]:
+        '''Every playerId with this full name'''
+        if name in self._duplicates:
+            return list(self._duplicates[name])
+        playerId = self._map.get(name)
+        return [] if playerId is None else [playerId]
+
+    def is_stale(self) -> bool:
+        return self._expired(self.fetched)
+
+    def _expired(self, fetched: Optional[float]) -> bool:
+        if fetched is None:
+            return True
+        # the player pool of a finished season does not change
+        if self.max_age is None or self.year < current_season():
+            return False
+        return time.time() - fetched >= self.max_age
+
+    def ensure(self, fetch: Callable[[], Iterable[dict]]) -> 'PlayerDirectory':
+        '''Loads the players from disk or with fetch when missing or stale
+
+        Leagues loading at the same time wait for a single download.
+        '''
+        if not self.is_stale():
+            return self
+        with self._lock:
+            if self.is_stale() and not self._load():
+                self.update(fetch())
+                self._save()
+        return self
+
+    def update(self, players: Iterable[dict], fetched: float = None) -> None:
+        '''Replaces the directory with the given players, any iterable of ESPN player dicts'''
+        self._replace(((player['id'], player['fullName']) for player in players), fetched)
+
+    def pairs(self) -> List[Tuple[int, str]]:
+        '''(playerId, fullName) of every player in the order ESPN lists them'''
+        return [(playerId, name) for (playerId, name) in self._map.items() if not isinstance(playerId, str)]
+
+    def restore(self, players: Iterable, fetched: float) -> bool:
+        '''Loads (playerId, fullName) pairs saved at fetched unless the directory holds newer players'''
+        with self._lock:
+            if self.fetched is not None and self.fetched >= fetched:
+                return False
+            self._replace(players, fetched)
+            return True
+
+    def _replace(self, players: Iterable, fetched: float = None) -> None:
+        player_map = {}
+        duplicates = {}
+        count = 0
+        for (playerId, name) in players:
+            count += 1
+            player_map[playerId] = name
+            if name not in player_map:
+                player_map[name] = playerId
+            elif name in duplicates:
+                duplicates[name].append(playerId)
+            else:
+                duplicates[name] = [player_map[name], playerId]
+        # swapped in whole so readers in other threads never see a half built map
+        (self._map, self._duplicates, self.players) = (player_map, duplicates, count)
+        self.fetched = time.time() if fetched is None else fetched
+
+    def _load(self) -> bool:
+        '''Loads a fresh copy from path, returns False when there is none'''
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('sport') != self.sport or data.get('year') != self.year or self._expired(data.get('fetched')):
+            return False
+        self._replace(data['players'], data['fetched'])
+        return True
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'sport': self.sport, 'year': self.year, 'fetched': self.fetched, 'players': self.pairs()}, f)
+        os.replace(tmp, self.path)
+
+
+_directories = {}
+_directories_lock = threading.Lock()
+
+
+def get_player_directory(sport: str, year: int) -> PlayerDirectory:
+    '''Returns the process wide PlayerDirectory for a sport and year'''
+    key = (sport, year)
+    with _directories_lock:
+        if key not in _directories:
+            _directories[key] = PlayerDirectory(sport, year)
+        return _directories[key]
+
+
+def set_player_directory(directory: Optional[PlayerDirectory], sport: str = None, year: int = None) -> None:
+    '''Registers directory as the shared one for its sport and year, None drops the shared one'''
+    key = (sport, year) if directory is None else (directory.sport, directory.year)
+    with _directories_lock:
+        if directory is None:
+            _directories.pop(key, None)
+        else:
+            _directories[key] = directory
@@ -1,3 +1,8 @@
-__all__ = ['EspnFantasyRequests']
+__all__ = ['EspnFantasyRequests', 'AsyncEspnFantasyRequests', 'Transport', 'ResponseCache', 'CachePolicy', 'RequestMetrics', 'RequestEvent', 'RetryPolicy', 'RateLimiter']
 
-from .espn_requests import EspnFantasyRequests
\ No newline at end of file
+from .espn_requests import EspnFantasyRequests
+from .async_requests import AsyncEspnFantasyRequests
+from .transport import Transport
+from .cache import ResponseCache, CachePolicy
+from .metrics import RequestMetrics, RequestEvent
+from .retry import RetryPolicy, RateLimiter
\ No newline at end of file
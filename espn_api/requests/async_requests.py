@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional
+
+from .espn_requests import EspnFantasyRequests
+
+# as many threads as the default Transport keeps pooled connections so every worker reuses one
+DEFAULT_MAX_WORKERS = 10
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def get_default_executor() -> Executor:
+    '''Returns the process wide bounded thread pool async requests run on when none is passed in'''
+    global _default_executor
+    if _default_executor is None:
+        with _default_executor_lock:
+            if _default_executor is None:
+                _default_executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix='espn_api')
+    return _default_executor
+
+
+def set_default_executor(executor: Optional[Executor]) -> None:
+    '''Replaces the process wide executor, None creates a fresh default one on next use'''
+    global _default_executor
+    with _default_executor_lock:
+        _default_executor = executor
+
+
+class AsyncEspnFantasyRequests(object):
+    '''Awaitable wrapper around EspnFantasyRequests
+
+    Each call runs the blocking request on a bounded thread pool so independent
+    views can be awaited together with asyncio.gather while sharing the pooled
+    Transport session. The pool is not the event loops default executor, so a
+    large fan out queues on it instead of starving other work of the loop.
+    Pass an executor sized for your fan out, or one matching a Transport with
+    a larger pool_maxsize, to run more requests at once.
+    '''
+    def __init__(self, espn_request: EspnFantasyRequests, executor: Executor = None):
+        self.espn_request = espn_request
+        self.executor = executor or get_default_executor()
+
+    async def run(self, func, *args, **kwargs):
+        '''Runs a blocking call on the executor'''
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def league_get(self, params: dict = None, headers: dict = None, extend: str = ''):
+        return await self.run(self.espn_request.league_get, params=params, headers=headers, extend=extend)
+
+    async def get(self, params: dict = None, headers: dict = None, extend: str = ''):
+        return await self.run(self.espn_request.get, params=params, headers=headers, extend=extend)
+
+    async def get_league(self):
+        return await self.run(self.espn_request.get_league)
+
+    async def get_pro_schedule(self):
+        return await self.run(self.espn_request.get_pro_schedule)
+
+    async def get_pro_players(self):
+        return await self.run(self.espn_request.get_pro_players)
+
+    async def get_league_draft(self):
+        return await self.run(self.espn_request.get_league_draft)
+
+    async def get_league_message_board(self, msg_types = None):
+        return await self.run(self.espn_request.get_league_message_board, msg_types)
+
+    async def get_player_card(self, playerIds: List[int], max_scoring_period: int, additional_filters: List = None):
+        return await self.run(self.espn_request.get_player_card, playerIds, max_scoring_period, additional_filters)
+
+    async def get_positional_ratings(self, scoring_period: int):
+        return await self.run(self.espn_request.get_positional_ratings, scoring_period)
+
+    async def get_matchup_scores(self, matchup_periods: List[int]):
+        return await self.run(self.espn_request.get_matchup_scores, matchup_periods)
+
+    async def get_box_scores(self, scoring_period: int, matchup_period: int):
+        return await self.run(self.espn_request.get_box_scores, scoring_period, matchup_period)
+
+    async def get_free_agents(self, scoring_period: int, size: int, slot_filter: List[int]):
+        return await self.run(self.espn_request.get_free_agents, scoring_period, size, slot_filter)
+
+    async def get_recent_activity(self, size: int, msg_types: List[int], offset: int = 0):
+        return await self.run(self.espn_request.get_recent_activity, size, msg_types, offset)
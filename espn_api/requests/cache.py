@@ -0,0 +1,128 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Union
+
+# seconds each view stays fresh for a season that is still being played
+VIEW_TTLS = {
+    'mTeam': 60,
+    'mRoster': 60,
+    'mMatchup': 60,
+    'mSettings': 60,
+    'mStandings': 60,
+    'mMatchupScore': 60,
+    'mScoreboard': 60,
+    'mDraftDetail': 3600,
+    'mPositionalRatings': 3600,
+    'proTeamSchedules_wl': 86400,
+    'players_wl': 86400,
+    'kona_player_info': 300,
+    'kona_playercard': 300,
+    'kona_league_communication': 60,
+    'kona_league_messageboard': 60,
+}
+
+
+def current_season(now: datetime = None) -> int:
+    '''Season year being played, a season runs into February of the next year'''
+    now = now or datetime.now()
+    return now.year if now.month >= 3 else now.year - 1
+
+
+class CachePolicy(object):
+    '''Decides how long a cached ESPN view stays fresh
+
+    A ttl of None never expires and a ttl of 0 is not cached.
+    '''
+    def __init__(self, view_ttls: dict = None, default_ttl: float = 60, completed_season_ttl: Optional[float] = None):
+        self.view_ttls = dict(VIEW_TTLS, **(view_ttls or {}))
+        self.default_ttl = default_ttl
+        self.completed_season_ttl = completed_season_ttl
+
+    def ttl(self, views: Union[str, List[str], None], year: int) -> Optional[float]:
+        # nothing changes once a season is over
+        if year < current_season():
+            return self.completed_season_ttl
+        if not isinstance(views, list):
+            views = [views]
+        # a request for several views is only fresh as long as its shortest lived view
+        ttls = [self.view_ttls.get(view, self.default_ttl) for view in views]
+        ttls = [ttl for ttl in ttls if ttl is not None]
+        return min(ttls) if ttls else None
+
+
+class ResponseCache(object):
+    '''SQLite backed cache of raw ESPN response bodies with per view ttl and LRU eviction'''
+    def __init__(self, path: str = ':memory:', max_bytes: int = 256 * 1024 * 1024, policy: CachePolicy = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.policy = policy or CachePolicy()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB, size INTEGER, expires REAL, accessed INTEGER)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self._conn.commit()
+        # access counter for LRU order, wall clock time can tie between quick calls
+        self._clock = self._conn.execute('SELECT COALESCE(MAX(accessed), 0) FROM responses').fetchone()[0]
+
+    def __repr__(self):
+        return 'ResponseCache(%s)' % (self.path, )
+
+    @staticmethod
+    def key(endpoint: str, params: dict = None, headers: dict = None, cookies: dict = None) -> str:
+        '''Cache key from the url, query params, x-fantasy-filter header and who is asking'''
+        filters = (headers or {}).get('x-fantasy-filter')
+        # cookies are part of the key so private league data is only served back to its owner
+        parts = [endpoint, json.dumps(params, sort_keys=True), filters, json.dumps(cookies, sort_keys=True)]
+        return hashlib.sha256('\n'.join(str(part) for part in parts).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT body, expires FROM responses WHERE key = ?', (key, )).fetchone()
+            if row is None:
+                return None
+            (body, expires) = row
+            if expires is not None and expires <= now:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key, ))
+                self._conn.commit()
+                return None
+            self._clock += 1
+            self._conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (self._clock, key))
+            self._conn.commit()
+            return bytes(body)
+
+    def set(self, key: str, body: bytes, ttl: Optional[float]) -> None:
+        if ttl == 0 or len(body) > self.max_bytes:
+            return
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+        with self._lock:
+            self._clock += 1
+            self._conn.execute('REPLACE INTO responses (key, body, size, expires, accessed) VALUES (?, ?, ?, ?, ?)', (key, body, len(body), expires, self._clock))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        '''Drops expired responses then the least recently used until under max_bytes'''
+        self._conn.execute('DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?', (time.time(), ))
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for (key, size) in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed').fetchall():
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key, ))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
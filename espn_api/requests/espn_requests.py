@@ -1,7 +1,11 @@
+import time
 import requests
-import json
 from .constant import FANTASY_BASE_ENDPOINT, FANTASY_SPORTS
+from .transport import Transport, get_default_transport
+from .cache import ResponseCache
+from .metrics import RequestEvent
 from ..utils.logger import Logger
+from ..utils import json_backend
 from typing import List
 
 
@@ -33,7 +37,7 @@ def checkRequestStatus(status: int, cookies=None, league_id=None) -> None:
 
 
 class EspnFantasyRequests(object):
-    def __init__(self, sport: str, year: int, league_id: int, cookies: dict = None, logger: Logger = None):
+    def __init__(self, sport: str, year: int, league_id: int, cookies: dict = None, logger: Logger = None, transport: Transport = None, cache: ResponseCache = None, metrics=None):
         if sport not in FANTASY_SPORTS:
             raise Exception(f'Unknown sport: {sport}, available options are {FANTASY_SPORTS.keys()}')
         self.year = year
@@ -41,6 +45,13 @@ class EspnFantasyRequests(object):
         self.ENDPOINT = FANTASY_BASE_ENDPOINT + FANTASY_SPORTS[sport] + '/seasons/' + str(self.year)
         self.cookies = cookies
         self.logger = logger
+        # shared pooled session unless the caller brings their own
+        self.transport = transport or get_default_transport()
+        self.cache = cache
+        # RequestMetrics, any object with record(event) or a callable taking a RequestEvent
+        self.metrics = metrics
+        # ETag / Last-Modified and body of the last response for conditional requests
+        self._validators = {}
 
         self.LEAGUE_ENDPOINT = FANTASY_BASE_ENDPOINT + FANTASY_SPORTS[sport]
         # older season data is stored at a different endpoint
@@ -49,30 +60,142 @@ class EspnFantasyRequests(object):
         else:
             self.LEAGUE_ENDPOINT += "/seasons/" + str(year) + "/segments/0/leagues/" + str(league_id)
 
-    def league_get(self, params: dict = None, headers: dict = None, extend: str = ''):
+    def league_get(self, params: dict = None, headers: dict = None, extend: str = '', conditional: bool = False):
         endpoint = self.LEAGUE_ENDPOINT + extend
-        r = requests.get(endpoint, params=params, headers=headers, cookies=self.cookies)
-        checkRequestStatus(r.status_code, cookies=self.cookies, league_id=self.league_id)
+        data = self._get(endpoint, params=params, headers=headers, league=True, conditional=conditional)
+        return data if self.year > 2017 else data[0]
 
+    def get(self, params: dict = None, headers: dict = None, extend: str = '', conditional: bool = False):
+        endpoint = self.ENDPOINT + extend
+        return self._get(endpoint, params=params, headers=headers, conditional=conditional)
+
+    def _get(self, endpoint: str, params: dict = None, headers: dict = None, league: bool = False, conditional: bool = False):
+        '''Requests an endpoint, serving it from the response cache when one is set and fresh
+
+        Conditional requests send the validators of the last response and when ESPN
+        answers 304 Not Modified the previously returned object is returned again.
+        '''
+        key = ResponseCache.key(endpoint, params=params, headers=headers, cookies=self.cookies)
+        view = RequestEvent.view_label(params)
+        if self.cache:
+            body = self.cache.get(key)
+            if body is not None:
+                start = time.perf_counter()
+                data = json_backend.loads(body)
+                self._record(endpoint, view, 200, size=len(body), parse_time=time.perf_counter() - start, source='cache')
+                return data
+
+        request_headers = headers
+        validator = self._validators.get(key) if conditional else None
+        if validator:
+            request_headers = dict(headers or {})
+            (etag, last_modified, _) = validator
+            if etag:
+                request_headers['If-None-Match'] = etag
+            if last_modified:
+                request_headers['If-Modified-Since'] = last_modified
+
+        start = time.perf_counter()
+        (r, retries) = self._send(endpoint, params, request_headers)
+        elapsed = time.perf_counter() - start
+        if validator and r.status_code == 304:
+            self._record(endpoint, view, 304, elapsed=elapsed, retries=retries, source='not_modified')
+            return validator[2]
+        if r.status_code != 200:
+            self._record(endpoint, view, r.status_code, elapsed=elapsed, size=len(r.content), retries=retries)
+        if league:
+            checkRequestStatus(r.status_code, cookies=self.cookies, league_id=self.league_id)
+        else:
+            checkRequestStatus(r.status_code)
+
+        # parse the body once, logging reuses the raw body instead of serializing the data again
+        start = time.perf_counter()
+        data = json_backend.loads(r.content)
+        self._record(endpoint, view, r.status_code, elapsed=elapsed, size=len(r.content), parse_time=time.perf_counter() - start, retries=retries)
         if self.logger:
-            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=r.json())
-        return r.json() if self.year > 2017 else r.json()[0]
+            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=data, body=r.content, elapsed=elapsed)
+        if self.cache:
+            self.cache.set(key, r.content, self.cache.policy.ttl((params or {}).get('view'), self.year))
+        if conditional and (r.headers.get('ETag') or r.headers.get('Last-Modified')):
+            self._validators[key] = (r.headers.get('ETag'), r.headers.get('Last-Modified'), data)
+        return data
 
-    def get(self, params: dict = None, headers: dict = None, extend: str = ''):
-        endpoint = self.ENDPOINT + extend
-        r = requests.get(endpoint, params=params, headers=headers, cookies=self.cookies)
-        checkRequestStatus(r.status_code)
+    def _stream(self, endpoint: str, params: dict = None, headers: dict = None, chunk_size: int = 64 * 1024):
+        '''Yields the items of a JSON array response while it downloads instead of decoding the whole body'''
+        key = ResponseCache.key(endpoint, params=params, headers=headers, cookies=self.cookies)
+        view = RequestEvent.view_label(params)
+        if self.cache:
+            body = self.cache.get(key)
+            if body is not None:
+                self._record(endpoint, view, 200, size=len(body), source='cache')
+                yield from json_backend.iter_array((body, ))
+                return
+
+        start = time.perf_counter()
+        (r, retries) = self._send(endpoint, params, headers, stream=True)
+        try:
+            if r.status_code != 200:
+                self._record(endpoint, view, r.status_code, elapsed=time.perf_counter() - start, retries=retries)
+            checkRequestStatus(r.status_code)
+
+            # the raw body is much smaller than the decoded items, keep it only to fill the cache
+            body = [] if self.cache else None
+            size = 0
 
+            def chunks():
+                nonlocal size
+                for chunk in r.iter_content(chunk_size):
+                    size += len(chunk)
+                    if body is not None:
+                        body.append(chunk)
+                    yield chunk
+
+            yield from json_backend.iter_array(chunks())
+        finally:
+            r.close()
+
+        # decoding is interleaved with the download so it is counted in elapsed
+        elapsed = time.perf_counter() - start
+        self._record(endpoint, view, r.status_code, elapsed=elapsed, size=size, retries=retries)
         if self.logger:
-            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=r.json())
-        return r.json()
+            self.logger.log_request(endpoint=endpoint, params=params, headers=headers, response=None, elapsed=elapsed, size=size)
+        if self.cache:
+            self.cache.set(key, b''.join(body), self.cache.policy.ttl((params or {}).get('view'), self.year))
+
+    def _send(self, endpoint: str, params: dict = None, headers: dict = None, stream: bool = False):
+        '''Sends the request retrying 429s, transient 5xxs, connection errors and timeouts per the transport retry policy'''
+        policy = self.transport.retry
+        attempt = 0
+        while True:
+            try:
+                r = self.transport.get(endpoint, params=params, headers=headers, cookies=self.cookies, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= policy.max_retries:
+                    raise
+                delay = policy.delay(attempt)
+            else:
+                if not policy.should_retry(r.status_code, attempt):
+                    return (r, attempt)
+                delay = policy.delay(attempt, r.headers.get('Retry-After'))
+                r.close()
+            if self.logger:
+                self.logger.logging.debug(f'ESPN API Retry: url: {endpoint} params: {params} attempt: {attempt + 1} in {delay:.2f}s')
+            time.sleep(delay)
+            attempt += 1
+
+    def _record(self, endpoint: str, view: str, status: int, **kwargs) -> None:
+        if self.metrics is None:
+            return
+        event = RequestEvent(self.league_id, self.year, endpoint, view, status, **kwargs)
+        record = getattr(self.metrics, 'record', self.metrics)
+        record(event)
 
     def get_league(self):
         '''Gets all of the leagues initial data (teams, roster, matchups, settings)'''
         params = {
             'view': ['mTeam', 'mRoster', 'mMatchup', 'mSettings', 'mStandings']
         }
-        data = self.league_get(params=params)
+        data = self.league_get(params=params, conditional=True)
         return data
 
     def get_pro_schedule(self):
@@ -80,7 +203,7 @@ class EspnFantasyRequests(object):
         params = {
             'view': 'proTeamSchedules_wl'
         }
-        data = self.get(params=params)
+        data = self.get(params=params, conditional=True)
         return data
 
     def get_pro_players(self):
@@ -89,10 +212,19 @@ class EspnFantasyRequests(object):
             'view': 'players_wl'
         }
         filters = {"filterActive": {"value": True}}
-        headers = {'x-fantasy-filter': json.dumps(filters)}
+        headers = {'x-fantasy-filter': json_backend.dumps(filters)}
         data = self.get(extend='/players', params=params, headers=headers)
         return data
 
+    def iter_pro_players(self):
+        '''Streams the current sports professional players one at a time without holding the whole list'''
+        params = {
+            'view': 'players_wl'
+        }
+        filters = {"filterActive": {"value": True}}
+        headers = {'x-fantasy-filter': json_backend.dumps(filters)}
+        return self._stream(self.ENDPOINT + '/players', params=params, headers=headers)
+
     def get_league_draft(self):
         '''Gets the leagues draft'''
         params = {
@@ -112,7 +244,7 @@ class EspnFantasyRequests(object):
             base_filter = {"sortMessageDate":{"sortPriority":1,"sortAsc":False}}
             for msg_type in msg_types:
                 filters['topicsByType'][msg_type] = base_filter
-            headers = {'x-fantasy-filter': json.dumps(filters)}
+            headers = {'x-fantasy-filter': json_backend.dumps(filters)}
 
         extend = "/segments/0/leagues/" + str(self.league_id) + '/communication'
 
@@ -127,11 +259,62 @@ class EspnFantasyRequests(object):
         if additional_filters : additional_value += additional_filters
 
         filters = {'players':{'filterIds':{'value': playerIds}, 'filterStatsForTopScoringPeriodIds':{'value': max_scoring_period, 'additionalValue': additional_value}}}
-        headers = {'x-fantasy-filter': json.dumps(filters)}
+        headers = {'x-fantasy-filter': json_backend.dumps(filters)}
+
+        data = self.league_get(params=params, headers=headers)
+        return data
+
+    def get_positional_ratings(self, scoring_period: int):
+        '''Gets how each pro team ranks against every position'''
+        params = {
+            'view': 'mPositionalRatings',
+            'scoringPeriodId': scoring_period,
+        }
+        data = self.league_get(params=params)
+        return data
+
+    def get_matchup_scores(self, matchup_periods: List[int]):
+        '''Gets the scores of the matchups in the given matchup periods'''
+        params = {
+            'view': 'mMatchupScore',
+        }
+        filters = {"schedule":{"filterMatchupPeriodIds":{"value":matchup_periods}}}
+        headers = {'x-fantasy-filter': json_backend.dumps(filters)}
+        data = self.league_get(params=params, headers=headers)
+        return data
+
+    def get_box_scores(self, scoring_period: int, matchup_period: int, conditional: bool = False):
+        '''Gets the matchups and lineups for a matchup period'''
+        params = {
+            'view': ['mMatchupScore', 'mScoreboard'],
+            'scoringPeriodId': scoring_period,
+        }
+        filters = {"schedule":{"filterMatchupPeriodIds":{"value":[matchup_period]}}}
+        headers = {'x-fantasy-filter': json_backend.dumps(filters)}
+        data = self.league_get(params=params, headers=headers, conditional=conditional)
+        return data
 
+    def get_free_agents(self, scoring_period: int, size: int, slot_filter: List[int]):
+        '''Gets the top owned free agents and waiver players'''
+        params = {
+            'view': 'kona_player_info',
+            'scoringPeriodId': scoring_period,
+        }
+        filters = {"players":{"filterStatus":{"value":["FREEAGENT","WAIVERS"]},"filterSlotIds":{"value":slot_filter},"limit":size,"sortPercOwned":{"sortPriority":1,"sortAsc":False},"sortDraftRanks":{"sortPriority":100,"sortAsc":True,"value":"STANDARD"}}}
+        headers = {'x-fantasy-filter': json_backend.dumps(filters)}
         data = self.league_get(params=params, headers=headers)
         return data
 
+    def get_recent_activity(self, size: int, msg_types: List[int], offset: int = 0):
+        '''Gets the leagues transaction messages'''
+        params = {
+            'view': 'kona_league_communication'
+        }
+        filters = {"topics":{"filterType":{"value":["ACTIVITY_TRANSACTIONS"]},"limit":size,"limitPerMessageSet":{"value":25},"offset":offset,"sortMessageDate":{"sortPriority":1,"sortAsc":False},"sortFor":{"sortPriority":2,"sortAsc":False},"filterIncludeMessageTypeIds":{"value":msg_types}}}
+        headers = {'x-fantasy-filter': json_backend.dumps(filters)}
+        data = self.league_get(extend='/communication/', params=params, headers=headers)
+        return data
+
     # Username and password no longer works using their API without using google recaptcha
     # Possibly revisit in future if anything changes
  
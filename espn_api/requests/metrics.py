@@ -0,0 +1,153 @@
+import threading
+from typing import Callable, Dict, List, Union
+
+
+class RequestEvent(object):
+    '''Timing and size of a single ESPN request
+
+    source is network, cache (served from the ResponseCache) or not_modified (a 304 answer)
+    '''
+    __slots__ = ('league_id', 'year', 'endpoint', 'view', 'status', 'elapsed', 'size', 'parse_time', 'retries', 'source')
+
+    def __init__(self, league_id: int, year: int, endpoint: str, view: str, status: int, elapsed: float = 0.0, size: int = 0, parse_time: float = 0.0, retries: int = 0, source: str = 'network'):
+        self.league_id = league_id
+        self.year = year
+        self.endpoint = endpoint
+        self.view = view
+        self.status = status
+        self.elapsed = elapsed
+        self.size = size
+        self.parse_time = parse_time
+        self.retries = retries
+        self.source = source
+
+    def __repr__(self):
+        return 'RequestEvent(%s, %s, %.3fs, %sB)' % (self.view, self.status, self.elapsed, self.size, )
+
+    @staticmethod
+    def view_label(params: dict = None) -> str:
+        '''Views requested joined with commas, empty when the request has none'''
+        view = (params or {}).get('view')
+        if isinstance(view, (list, tuple)):
+            return ','.join(view)
+        return view or ''
+
+
+class ViewStats(object):
+    '''Running totals for one view'''
+    __slots__ = ('count', 'errors', 'cache_hits', 'not_modified', 'total_time', 'max_time', 'bytes', 'parse_time', 'retries', 'statuses')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.not_modified = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.bytes = 0
+        self.parse_time = 0.0
+        self.retries = 0
+        self.statuses = {}
+
+    def __repr__(self):
+        return 'ViewStats(count=%s, avg=%.3fs, bytes=%s)' % (self.count, self.avg_time, self.bytes, )
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+    def add(self, event: RequestEvent) -> None:
+        self.count += 1
+        self.total_time += event.elapsed
+        self.max_time = max(self.max_time, event.elapsed)
+        self.bytes += event.size
+        self.parse_time += event.parse_time
+        self.retries += event.retries
+        self.statuses[event.status] = self.statuses.get(event.status, 0) + 1
+        if event.source == 'cache':
+            self.cache_hits += 1
+        elif event.source == 'not_modified':
+            self.not_modified += 1
+        elif event.status != 200:
+            self.errors += 1
+
+
+class RequestMetrics(object):
+    '''In memory aggregator of RequestEvents keyed by view
+
+    Pass one to EspnFantasyRequests (or a League) as metrics, any object with
+    a record(event) method or a plain callable taking the event works as well.
+    Callbacks added with subscribe are called with every recorded event.
+    '''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self._callbacks = []
+
+    def __repr__(self):
+        return 'RequestMetrics(%s requests)' % (self.count, )
+
+    def subscribe(self, callback: Callable[[RequestEvent], None]) -> None:
+        self._callbacks.append(callback)
+
+    def record(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._views.get(event.view)
+            if stats is None:
+                stats = self._views[event.view] = ViewStats()
+            stats.add(event)
+        for callback in self._callbacks:
+            callback(event)
+
+    @property
+    def count(self) -> int:
+        return sum(stats.count for stats in self._views.values())
+
+    def summary(self) -> Dict[str, ViewStats]:
+        '''Stats per view, slowest total time first'''
+        with self._lock:
+            views = sorted(self._views.items(), key=lambda item: item[1].total_time, reverse=True)
+        return dict(views)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views = {}
+
+    def to_prometheus(self, prefix: str = 'espn_api') -> str:
+        '''Stats in the Prometheus text exposition format'''
+        with self._lock:
+            views = sorted(self._views.items())
+        lines = []
+
+        def metric(name: str, kind: str, description: str, samples: List):
+            lines.append(f'# HELP {prefix}_{name} {description}')
+            lines.append(f'# TYPE {prefix}_{name} {kind}')
+            for (suffix, labels, value) in samples:
+                label = ','.join(f'{key}="{_escape(val)}"' for (key, val) in labels)
+                lines.append(f'{prefix}_{name}{suffix}{{{label}}} {_format(value)}')
+
+        metric('requests_total', 'counter', 'ESPN API requests by view and status',
+               [('', (('view', view), ('status', status)), count) for (view, stats) in views for (status, count) in sorted(stats.statuses.items())])
+        metric('request_seconds', 'summary', 'Time spent waiting on ESPN by view',
+               [sample for (view, stats) in views for sample in (('_sum', (('view', view), ), stats.total_time), ('_count', (('view', view), ), stats.count))])
+        metric('request_seconds_max', 'gauge', 'Slowest ESPN request by view',
+               [('', (('view', view), ), stats.max_time) for (view, stats) in views])
+        metric('response_bytes_total', 'counter', 'Response body bytes by view',
+               [('', (('view', view), ), stats.bytes) for (view, stats) in views])
+        metric('parse_seconds_total', 'counter', 'Time spent decoding responses by view',
+               [('', (('view', view), ), stats.parse_time) for (view, stats) in views])
+        metric('request_retries_total', 'counter', 'Retried ESPN requests by view',
+               [('', (('view', view), ), stats.retries) for (view, stats) in views])
+        metric('cache_hits_total', 'counter', 'Responses served from the cache or a 304 by view',
+               [('', (('view', view), ), stats.cache_hits + stats.not_modified) for (view, stats) in views])
+        metric('request_errors_total', 'counter', 'Failed ESPN requests by view',
+               [('', (('view', view), ), stats.errors) for (view, stats) in views])
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value: Union[int, float]) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
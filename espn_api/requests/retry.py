@@ -0,0 +1,104 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+
+class RetryPolicy(object):
+    '''When and how long to wait before retrying a failed ESPN request
+
+    Rate limited (429) and transient server errors plus connection errors and
+    timeouts are retried with exponential backoff and full jitter. A Retry-After
+    header from ESPN is honored up to max_retry_after seconds.
+    '''
+    def __init__(self, max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 30, jitter: bool = True,
+                 statuses: Iterable[int] = (429, 500, 502, 503, 504), max_retry_after: float = 60):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.max_retry_after = max_retry_after
+
+    def __repr__(self):
+        return 'RetryPolicy(max_retries=%s, backoff=%s)' % (self.max_retries, self.backoff, )
+
+    def should_retry(self, status: int, attempt: int) -> bool:
+        return attempt < self.max_retries and status in self.statuses
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        '''Seconds to sleep before retry number attempt + 1'''
+        wait = self._retry_after(retry_after)
+        if wait is not None:
+            return min(wait, self.max_retry_after)
+        wait = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, wait) if self.jitter else wait
+
+    @staticmethod
+    def _retry_after(value: str = None) -> Optional[float]:
+        '''Retry-After is either a number of seconds or an HTTP date'''
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket(object):
+    '''Allows rate requests per second on average with bursts of up to burst requests'''
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        '''Blocks until a token is free, returns the seconds spent waiting'''
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class RateLimiter(object):
+    '''Client side token bucket per host
+
+    Attach one to a Transport, every League sharing that Transport then
+    shares the same budget of requests to ESPN.
+    '''
+    def __init__(self, rate: float = 10, burst: int = 10):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'RateLimiter(rate=%s, burst=%s)' % (self.rate, self.burst, )
+
+    def acquire(self, url: str) -> float:
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket.acquire()
@@ -0,0 +1,87 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Optional, Tuple, Union
+from .retry import RetryPolicy, RateLimiter
+
+# requests per second and burst per host of the default transport
+DEFAULT_RATE = 10
+DEFAULT_BURST = 20
+
+
+class Transport(object):
+    '''Pooled HTTP transport shared by EspnFantasyRequests instances
+
+    Owns a keep-alive requests.Session so repeated calls to the same host
+    reuse connections instead of doing a new TCP/TLS handshake each time.
+    The retry policy and rate limiter travel with it so every League using
+    the same Transport backs off and throttles together.
+    '''
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, timeout: Union[float, Tuple[float, float], None] = (5, 30), keep_alive: bool = True,
+                 retry: RetryPolicy = None, rate_limit: RateLimiter = None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.retry = retry or RetryPolicy()
+        self.rate_limit = rate_limit
+        self._session = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'Transport(pool_maxsize=%s, timeout=%s)' % (self.pool_maxsize, self.timeout, )
+
+    @property
+    def session(self) -> requests.Session:
+        '''Session is created lazily so a Transport is cheap to build'''
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def get(self, url: str, params: dict = None, headers: dict = None, cookies: dict = None, stream: bool = False) -> requests.Response:
+        if self.rate_limit:
+            self.rate_limit.acquire(url)
+        return self.session.get(url, params=params, headers=headers, cookies=cookies, timeout=self.timeout, stream=stream)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    '''Returns the process wide Transport used when none is passed in
+
+    Every League on it shares a conservative per host budget of DEFAULT_RATE
+    requests per second. A Transport built by hand is not throttled unless
+    it is given a rate_limit.
+    '''
+    global _default_transport
+    if _default_transport is None:
+        with _default_lock:
+            if _default_transport is None:
+                _default_transport = Transport(rate_limit=RateLimiter(DEFAULT_RATE, DEFAULT_BURST))
+    return _default_transport
+
+
+def set_default_transport(transport: Optional[Transport]) -> None:
+    '''Replaces the process wide Transport, None resets to a fresh default on next use'''
+    global _default_transport
+    with _default_lock:
+        _default_transport = transport
@@ -0,0 +1,127 @@
+'''JSON decoding and encoding through the fastest library installed
+
+orjson is used when installed, then ujson, then the standard library. The
+choice can be changed at runtime with set_backend, for example to compare
+results or to fall back if a faster library misbehaves.
+'''
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj).decode('utf-8')
+
+
+def _ujson_dumps(obj: Any) -> str:
+    return ujson.dumps(obj, ensure_ascii=True, escape_forward_slashes=False)
+
+
+def _json_dumps(obj: Any) -> str:
+    # compact like the faster libraries so every backend builds the same headers
+    return json.dumps(obj, separators=(',', ':'))
+
+
+BACKENDS = {
+    'orjson': (orjson.loads, _orjson_dumps) if orjson else None,
+    'ujson': (ujson.loads, _ujson_dumps) if ujson else None,
+    'json': (json.loads, _json_dumps),
+}
+
+_backend = None
+_loads = None
+_dumps = None
+
+
+def available_backends() -> list:
+    return [name for (name, funcs) in BACKENDS.items() if funcs]
+
+
+def set_backend(name: str = None) -> str:
+    '''Switches backend, None picks the fastest installed one. Returns the backend in use'''
+    global _backend, _loads, _dumps
+    if name is None:
+        name = available_backends()[0]
+    funcs = BACKENDS.get(name)
+    if funcs is None:
+        raise ValueError(f'JSON backend {name} is not available, options are {available_backends()}')
+    (_loads, _dumps) = funcs
+    _backend = name
+    return name
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return _loads(data)
+
+
+def dumps(obj: Any) -> str:
+    return _dumps(obj)
+
+
+def iter_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    '''Yields the items of a top level JSON array while its bytes arrive
+
+    Only the undecoded tail of the body is held in memory, so a huge array can
+    be consumed item by item without ever building the full list.
+    '''
+    text = codecs.getincrementaldecoder('utf-8')()
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0
+    started = False
+    done = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\n\r':
+            pos += 1
+        if pos < len(buffer):
+            char = buffer[pos]
+            if not started:
+                if char != '[':
+                    raise ValueError('Expected a JSON array')
+                started = True
+                pos += 1
+                continue
+            if char == ']':
+                return
+            if char == ',':
+                pos += 1
+                continue
+            try:
+                (item, end) = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if done:
+                    raise
+                end = None
+            # an item not followed by a separator yet may continue in the next chunk, like 2 of 2.5
+            if end is not None and (done or (end < len(buffer) and buffer[end] in ' \t\n\r,]')):
+                yield item
+                pos = end
+                continue
+        elif done:
+            raise ValueError('Unexpected end of JSON array')
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            buffer = buffer[pos:] + text.decode(b'', final=True)
+            done = True
+        else:
+            buffer = buffer[pos:] + text.decode(chunk)
+        pos = 0
+
+
+set_backend()
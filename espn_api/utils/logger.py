@@ -1,10 +1,13 @@
 import logging
 import sys
-import json
+from . import json_backend
 
 class Logger(object):
-    def __init__(self, name: str, debug=False):
+    def __init__(self, name: str, debug=False, body_limit: int = None):
         level = logging.DEBUG if debug else logging.INFO
+        self.level = level
+        # None logs whole response bodies, 0 only their size and n the first n characters
+        self.body_limit = body_limit
         self.logging = logging.getLogger(name)
 
         # if logger already exists don't add handlers
@@ -20,8 +23,34 @@ class Logger(object):
         self.logging.addHandler(handler)
         self.logging.setLevel(level)
 
-    def log_request(self, endpoint: str, response: dict, params: dict = None, headers: dict = None):
-        log = f'ESPN API Request: url: {endpoint} params: {params} headers: {headers} \nESPN API Response: {json.dumps(response)}'
+    def is_debug(self) -> bool:
+        return self.level <= logging.DEBUG and self.logging.isEnabledFor(logging.DEBUG)
+
+    def log_request(self, endpoint: str, response: dict, params: dict = None, headers: dict = None, body: bytes = None, elapsed: float = None, size: int = None):
+        '''Logs a request at debug level, the response is only serialized when debug logging is on
+
+        A streamed response has neither response nor body, only its size is logged.
+        '''
+        if not self.is_debug():
+            return
+        text = None
+        if body is not None:
+            text = body.decode('utf-8', 'replace')
+            size = len(body)
+        elif response is not None:
+            text = json_backend.dumps(response)
+            size = len(text)
+        log = f'ESPN API Request: url: {endpoint} params: {params} headers: {headers}'
+        if elapsed is not None:
+            log += f' time: {elapsed * 1000:.0f}ms'
+        if size is not None:
+            log += f' size: {size}B'
+        if text is None:
+            pass
+        elif self.body_limit is None:
+            log += f' \nESPN API Response: {text}'
+        elif self.body_limit > 0:
+            log += f' \nESPN API Response: {text[:self.body_limit]}' + ('...' if len(text) > self.body_limit else '')
         self.logging.debug(log)
 
 
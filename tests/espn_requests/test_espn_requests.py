@@ -2,6 +2,13 @@ from unittest import mock, TestCase
 import requests_mock
 import io
 from espn_api.requests.espn_requests import EspnFantasyRequests
+from espn_api.requests.transport import Transport, get_default_transport
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+from espn_api.requests.cache import ResponseCache, CachePolicy, current_season
+from espn_api.requests.metrics import RequestMetrics
+from espn_api.requests.retry import RetryPolicy, RateLimiter
+from espn_api.utils.logger import Logger
+from espn_api.utils import json_backend
 
 class EspnRequestsTest(TestCase):
 
@@ -11,6 +18,191 @@ class EspnRequestsTest(TestCase):
         url_api_key = 'https://registerdisney.go.com/jgc/v5/client/ESPN-FANTASYLM-PROD/api-key?langPref=en-US'
         mock_request.post(url_api_key, status_code=400)
 
+    @requests_mock.Mocker()
+    def test_shared_transport(self, mock_request):
+        endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/2019/segments/0/leagues/1234'
+        mock_request.get(endpoint + '?view=mDraftDetail', status_code=200, json={'draftDetail': {}})
+
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019)
+        other = EspnFantasyRequests(sport='nfl', league_id=4321, year=2019)
+        self.assertIs(request.transport, get_default_transport())
+        self.assertIs(request.transport.session, other.transport.session)
+        # leagues on the default transport share one per host budget
+        self.assertIsInstance(request.transport.rate_limit, RateLimiter)
+        self.assertEqual(request.get_league_draft(), {'draftDetail': {}})
+
+        transport = Transport(pool_maxsize=2, timeout=1)
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, transport=transport)
+        self.assertEqual(request.get_league_draft(), {'draftDetail': {}})
+        self.assertEqual(mock_request.last_request.timeout, 1)
+        transport.close()
+
+    @requests_mock.Mocker()
+    def test_response_cache(self, mock_request):
+        year = current_season()
+        endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/' + str(year) + '/segments/0/leagues/1234'
+        mock_request.get(endpoint + '?view=mDraftDetail', status_code=200, json={'draftDetail': {'drafted': True}})
+
+        cache = ResponseCache()
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=year, cache=cache)
+        self.assertEqual(request.get_league_draft(), {'draftDetail': {'drafted': True}})
+        self.assertEqual(request.get_league_draft(), {'draftDetail': {'drafted': True}})
+        self.assertEqual(mock_request.call_count, 1)
+
+        # different cookies do not share cached responses
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=year, cookies={'espn_s2': '1', 'SWID': '2'}, cache=cache)
+        request.get_league_draft()
+        self.assertEqual(mock_request.call_count, 2)
+
+    @requests_mock.Mocker()
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    def test_debug_logging(self, mock_request, mock_stdout):
+        endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/2019/segments/0/leagues/1234'
+        mock_request.get(endpoint + '?view=mDraftDetail', status_code=200, json={'draftDetail': {'picks': list(range(100))}})
+
+        logger = Logger(name='test debug logging', debug=False)
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, logger=logger)
+        request.get_league_draft()
+        # an unserializable response shows nothing is dumped when debug is off
+        logger.log_request(endpoint=endpoint, response=object())
+        self.assertEqual(mock_stdout.getvalue(), '')
+
+        logger = Logger(name='test debug logging body', debug=True, body_limit=20)
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, logger=logger)
+        self.assertEqual(request.get_league_draft(), {'draftDetail': {'picks': list(range(100))}})
+        log = mock_stdout.getvalue()
+        self.assertIn('size: ', log)
+        self.assertIn('time: ', log)
+        self.assertIn('ESPN API Response: {"draftDetail": {"pi...', log)
+
+    @requests_mock.Mocker()
+    def test_request_metrics(self, mock_request):
+        endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/2019/segments/0/leagues/1234'
+        mock_request.get(endpoint + '?view=mDraftDetail', status_code=200, json={'draftDetail': {}})
+        mock_request.get(endpoint + '?view=mPositionalRatings', status_code=500)
+
+        metrics = RequestMetrics()
+        events = []
+        metrics.subscribe(events.append)
+        transport = Transport(retry=RetryPolicy(max_retries=0))
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, metrics=metrics, transport=transport)
+        request.get_league_draft()
+        request.get_league_draft()
+        with self.assertRaises(Exception):
+            request.get_positional_ratings(1)
+
+        self.assertEqual(len(events), 3)
+        self.assertEqual(events[0].size, len(b'{"draftDetail": {}}'))
+        summary = metrics.summary()
+        self.assertEqual(summary['mDraftDetail'].count, 2)
+        self.assertEqual(summary['mPositionalRatings'].errors, 1)
+
+        text = metrics.to_prometheus()
+        self.assertIn('espn_api_requests_total{view="mDraftDetail",status="200"} 2', text)
+        self.assertIn('espn_api_requests_total{view="mPositionalRatings",status="500"} 1', text)
+        self.assertIn('espn_api_request_seconds_count{view="mDraftDetail"} 2', text)
+
+        # a plain callable works as the metrics hook
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, metrics=events.append)
+        request.get_league_draft()
+        self.assertEqual(events[-1].view, 'mDraftDetail')
+
+    @requests_mock.Mocker()
+    @mock.patch('espn_api.requests.espn_requests.time.sleep')
+    def test_retry(self, mock_request, mock_sleep):
+        endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/2019/segments/0/leagues/1234'
+        mock_request.get(endpoint + '?view=mDraftDetail', [
+            {'status_code': 503},
+            {'status_code': 429, 'headers': {'Retry-After': '7'}},
+            {'status_code': 200, 'json': {'draftDetail': {}}},
+        ])
+
+        metrics = RequestMetrics()
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, metrics=metrics)
+        self.assertEqual(request.get_league_draft(), {'draftDetail': {}})
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertLessEqual(mock_sleep.call_args_list[0][0][0], 0.5)
+        self.assertEqual(mock_sleep.call_args_list[1][0][0], 7)
+        self.assertEqual(metrics.summary()['mDraftDetail'].retries, 2)
+
+        # gives up after max_retries
+        mock_request.get(endpoint + '?view=mDraftDetail', status_code=503)
+        transport = Transport(retry=RetryPolicy(max_retries=2, jitter=False))
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019, transport=transport)
+        with self.assertRaises(Exception):
+            request.get_league_draft()
+        self.assertEqual(mock_sleep.call_args_list[-2:], [mock.call(0.5), mock.call(1.0)])
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(rate=1000, burst=2)
+        self.assertEqual(limiter.acquire('https://example.com/a'), 0)
+        self.assertEqual(limiter.acquire('https://example.com/b'), 0)
+        self.assertGreater(limiter.acquire('https://example.com/c'), 0)
+        # each host has its own bucket
+        self.assertEqual(limiter.acquire('https://other.example.com/a'), 0)
+
+    def test_json_backend(self):
+        default = json_backend.get_backend()
+        try:
+            for name in json_backend.available_backends():
+                json_backend.set_backend(name)
+                self.assertEqual(json_backend.dumps({'players': {'filterIds': {'value': [1, 2]}}}), '{"players":{"filterIds":{"value":[1,2]}}}')
+                self.assertEqual(json_backend.loads(b'{"a": [1, "b"]}'), {'a': [1, 'b']})
+            with self.assertRaises(ValueError):
+                json_backend.set_backend('missing')
+        finally:
+            json_backend.set_backend(default)
+
+    @requests_mock.Mocker()
+    def test_stream_pro_players(self, mock_request):
+        with open('tests/football/unit/data/league_players_2018.json', 'rb') as data:
+            body = data.read()
+        mock_request.get(FANTASY_BASE_ENDPOINT + 'ffl/seasons/2019/players?view=players_wl', content=body)
+
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019)
+        players = request.get_pro_players()
+        self.assertEqual(list(request.iter_pro_players()), players)
+        # items split across chunks and multi byte characters are decoded the same
+        chunks = [body[i:i + 1000] for i in range(0, len(body), 1000)]
+        self.assertEqual(list(json_backend.iter_array(chunks)), players)
+        self.assertEqual(list(json_backend.iter_array([b'[1', b'2.', b'5, "\xc3', b'\xa9"]'])), [12.5, '\u00e9'])
+        with self.assertRaises(ValueError):
+            list(json_backend.iter_array([b'{"players": []}']))
+
+    @requests_mock.Mocker()
+    def test_conditional_request(self, mock_request):
+        endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/2019'
+        mock_request.get(endpoint + '?view=proTeamSchedules_wl', [
+            {'status_code': 200, 'json': {'settings': {}}, 'headers': {'ETag': '"v1"'}},
+            {'status_code': 304},
+        ])
+
+        request = EspnFantasyRequests(sport='nfl', league_id=1234, year=2019)
+        data = request.get_pro_schedule()
+        self.assertIs(request.get_pro_schedule(), data)
+        self.assertEqual(mock_request.last_request.headers['If-None-Match'], '"v1"')
+
+    def test_cache_policy(self):
+        policy = CachePolicy(view_ttls={'mDraftDetail': 0})
+        year = current_season()
+        self.assertEqual(policy.ttl('mDraftDetail', year), 0)
+        self.assertEqual(policy.ttl(['mTeam', 'proTeamSchedules_wl'], year), 60)
+        self.assertEqual(policy.ttl('mMatchupScore', year - 1), None)
+
+    def test_cache_eviction(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.set('a', b'12345', None)
+        cache.set('b', b'12345', None)
+        cache.get('a')
+        cache.set('c', b'12345', None)
+        self.assertEqual(cache.get('a'), b'12345')
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('c'), b'12345')
+
+        cache.set('d', b'12345', -1)
+        self.assertEqual(cache.get('d'), None)
+
     # @requests_mock.Mocker()
     # @mock.patch('sys.stdout', new_callable=io.StringIO)
     # def test_authentication_api_fail(self, mock_request, mock_stdout):
@@ -0,0 +1,203 @@
+from unittest import mock, TestCase
+from espn_api.football import AsyncLeague, Player
+from espn_api.football.pro_schedule import ProSchedule, get_pro_schedule, set_pro_schedule
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from espn_api.football.player_resolver import PlayerResolver, chunk_player_ids
+from espn_api.requests.async_requests import get_default_executor
+from espn_api.player_directory import PlayerDirectory, set_player_directory
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+import requests_mock
+import asyncio
+import json
+
+
+class AsyncLeagueTest(TestCase):
+    def setUp(self):
+        self.league_id = 123
+        self.season = 2019
+        self.espn_endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/' + str(self.season) + '/segments/0/leagues/' + str(self.league_id)
+        self.base_endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/' + str(self.season)
+        with open('tests/football/unit/data/league_2019_playerCard.json') as data:
+            self.player_card_data = json.loads(data.read())
+        with open('tests/football/unit/data/pro_schedule_2024.json') as data:
+            self.pro_schedule_data = json.loads(data.read())
+
+    def test_blank_league_init(self):
+        league = AsyncLeague(self.league_id, self.season)
+        self.assertEqual(repr(league), 'AsyncLeague(123, 2019)')
+        self.assertEqual(len(league.teams), 0)
+
+    def test_log_body_limit(self):
+        league = AsyncLeague(self.league_id, self.season, log_body_limit=0)
+        self.assertEqual(league.logger.body_limit, 0)
+        self.assertIs(league.espn_request.logger, league.logger)
+
+    def test_default_executor(self):
+        league = AsyncLeague(self.league_id, self.season)
+        other = AsyncLeague(self.league_id, self.season)
+        # a bounded pool shared by every league instead of the event loops default executor
+        self.assertIs(league.async_request.executor, get_default_executor())
+        self.assertIs(other.async_request.executor, league.async_request.executor)
+
+    @requests_mock.Mocker()
+    def test_scoreboard(self, m):
+        with open('tests/football/unit/data/league_matchupScore_2018.json') as f:
+            data = json.loads(f.read())
+        m.get(self.espn_endpoint + '?view=mMatchupScore', status_code=200, json=data)
+
+        league = AsyncLeague(self.league_id, self.season)
+        scoreboard = asyncio.run(league.scoreboard(1))
+        self.assertEqual(scoreboard[0].home_score, 125.5)
+        self.assertEqual(json.loads(m.last_request.headers['x-fantasy-filter']), {'schedule': {'filterMatchupPeriodIds': {'value': [1]}}})
+
+        scoreboards = asyncio.run(league.scoreboard_range(1, 2))
+        self.assertEqual(json.loads(m.last_request.headers['x-fantasy-filter']), {'schedule': {'filterMatchupPeriodIds': {'value': [1, 2]}}})
+        self.assertEqual([matchup.home_score for matchup in scoreboards[1]], [matchup.home_score for matchup in scoreboard])
+
+    @requests_mock.Mocker()
+    def test_player_info(self, m):
+        m.get(self.espn_endpoint + '?view=kona_playercard', status_code=200, json=self.player_card_data)
+        m.get(self.base_endpoint + '?view=proTeamSchedules_wl', status_code=200, json=self.pro_schedule_data)
+
+        league = AsyncLeague(self.league_id, self.season)
+        league.finalScoringPeriod = 17
+        player = asyncio.run(league.player_info(playerId=3045147))
+        self.assertEqual(player.name, 'James Conner')
+        self.assertEqual(player.stats[1]['points'], 10.5)
+
+        player = asyncio.run(league.player_info('Not A Player'))
+        self.assertEqual(player, None)
+
+    @requests_mock.Mocker()
+    def test_player_info_shared_name(self, m):
+        m.get(self.espn_endpoint + '?view=kona_playercard', status_code=200, json=self.player_card_data)
+        m.get(self.base_endpoint + '?view=proTeamSchedules_wl', status_code=200, json=self.pro_schedule_data)
+        directory = PlayerDirectory('nfl', self.season)
+        directory.update([{'id': 3045147, 'fullName': 'James Conner'}, {'id': 1, 'fullName': 'James Conner'}])
+        set_player_directory(directory)
+
+        league = AsyncLeague(self.league_id, self.season)
+        league.finalScoringPeriod = 17
+        # the first player with the name by default
+        player = asyncio.run(league.player_info('James Conner'))
+        self.assertEqual(player.name, 'James Conner')
+        self.assertEqual(json.loads(m.last_request.headers['x-fantasy-filter'])['players']['filterIds']['value'], [3045147])
+
+        players = asyncio.run(league.player_info('James Conner', all_matches=True))
+        self.assertEqual([player.name for player in players], ['James Conner'])
+        self.assertEqual(json.loads(m.last_request.headers['x-fantasy-filter'])['players']['filterIds']['value'], [3045147, 1])
+        set_player_directory(None, 'nfl', self.season)
+
+    @requests_mock.Mocker()
+    def test_shared_pro_schedule(self, m):
+        m.get(self.espn_endpoint + '?view=kona_playercard', status_code=200, json=self.player_card_data)
+        m.get(self.base_endpoint + '?view=proTeamSchedules_wl', status_code=200, json=self.pro_schedule_data)
+        set_pro_schedule(self.season, None)
+
+        league = AsyncLeague(self.league_id, self.season)
+        league.finalScoringPeriod = 17
+        player = asyncio.run(league.player_info(playerId=3045147))
+        asyncio.run(league.player_info(playerId=3045147))
+        other = AsyncLeague(self.league_id, self.season)
+        other.finalScoringPeriod = 17
+        asyncio.run(other.player_info(playerId=3045147))
+        self.assertEqual(len([r for r in m.request_history if 'proTeamSchedules_wl' in r.url]), 1)
+
+        # the schedule view matches the schedule built from the raw pro team games
+        pro_team_games = league._parse_all_pro_schedule(self.pro_schedule_data)
+        expected = Player(self.player_card_data['players'][0], self.season, pro_team_games)
+        self.assertEqual(dict(player.schedule), expected.schedule)
+        self.assertEqual(repr(player.schedule), repr(expected.schedule))
+
+        pro_schedule = ProSchedule(self.pro_schedule_data)
+        for week in (1, 5, 17):
+            self.assertEqual(pro_schedule.week(week), league._parse_pro_schedule(self.pro_schedule_data, week))
+        set_pro_schedule(self.season, None)
+
+    def test_pro_schedule_per_year(self):
+        years = [2010, 2011, 2012, 2013]
+        # every season has to be fetching at once to pass the barrier, one lock for all would time out
+        barrier = threading.Barrier(len(years), timeout=5)
+        fetched = []
+
+        def fetch(year):
+            fetched.append(year)
+            barrier.wait()
+            return self.pro_schedule_data
+
+        for year in years:
+            set_pro_schedule(year, None)
+        with ThreadPoolExecutor(max_workers=len(years) * 2) as executor:
+            schedules = list(executor.map(lambda year: get_pro_schedule(year, lambda: fetch(year)), years * 2))
+        self.assertEqual(sorted(fetched), years)
+        self.assertEqual(schedules[:len(years)], schedules[len(years):])
+        for year in years:
+            set_pro_schedule(year, None)
+
+    @requests_mock.Mocker()
+    def test_box_scores_range(self, m):
+        m.get(self.base_endpoint + '?view=proTeamSchedules_wl', status_code=200, json=self.pro_schedule_data)
+        league = AsyncLeague(self.league_id, self.season)
+        (league.current_week, league.currentMatchupPeriod) = (3, 2)
+        league.settings = mock.Mock(matchup_periods={1: [1], 2: [2, 3]})
+        (requested, ratings, cancelled, blocked) = ([], [], [], set())
+
+        async def get_box_scores(scoring_period, matchup_period):
+            requested.append((scoring_period, matchup_period))
+            if scoring_period in blocked:
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(scoring_period)
+                    raise
+            return {'schedule': []}
+
+        async def get_positional_ratings(scoring_period):
+            ratings.append(scoring_period)
+            return {}
+        league.async_request.get_box_scores = get_box_scores
+        league.async_request.get_positional_ratings = get_positional_ratings
+
+        async def read_all():
+            return [week async for (week, _) in league.box_scores_range(1, 4)]
+
+        async def read_first():
+            box_scores = league.box_scores_range(1, 3)
+            first = await box_scores.__anext__()
+            await box_scores.aclose()
+            await asyncio.sleep(0)
+            # read before asyncio.run cancels whatever is left on exit
+            return (first, sorted(cancelled))
+
+        weeks = asyncio.run(read_all())
+        self.assertEqual(sorted(weeks), [1, 2, 3, 4])
+        self.assertEqual(sorted(requested), [(1, 1), (2, 2), (3, 2), (3, 2)])
+        self.assertEqual(sorted(ratings), [1, 2, 3])
+
+        # closing early cancels the weeks still waiting on ESPN
+        blocked.update([2, 3])
+        self.assertEqual(asyncio.run(read_first()), ((1, []), [2, 3]))
+
+    @requests_mock.Mocker()
+    def test_player_info_chunks(self, m):
+        m.get(self.espn_endpoint + '?view=kona_playercard', status_code=200, json=self.player_card_data)
+        m.get(self.base_endpoint + '?view=proTeamSchedules_wl', status_code=200, json=self.pro_schedule_data)
+
+        self.assertEqual(chunk_player_ids(range(120)), [list(range(50)), list(range(50, 100)), list(range(100, 120))])
+        self.assertEqual(chunk_player_ids([1234567] * 10, max_bytes=24), [[1234567] * 3] * 3 + [[1234567]])
+
+        league = AsyncLeague(self.league_id, self.season)
+        league.finalScoringPeriod = 17
+        players = asyncio.run(league.player_info(playerId=list(range(120))))
+        cards = [r for r in m.request_history if 'kona_playercard' in r.url]
+        self.assertEqual(len(cards), 3)
+        self.assertEqual(len(players), 3)
+        self.assertEqual(len(json.loads(cards[0].headers['x-fantasy-filter'])['players']['filterIds']['value']), 50)
+
+        # resolved players are remembered, unknown ids included
+        fetched = []
+        resolver = PlayerResolver(lambda ids: fetched.append(ids) or [players[0]])
+        self.assertEqual(resolver.resolve([3045147, 1, 3045147]), {3045147: players[0], 1: None})
+        self.assertEqual(resolver.resolve([1, 3045147]), {3045147: players[0], 1: None})
+        self.assertEqual(fetched, [[3045147, 1]])
@@ -1,5 +1,6 @@
 from unittest import mock, TestCase
-from espn_api.football import League, BoxPlayer
+from espn_api.football import League, AsyncLeague, BoxPlayer
+from espn_api.football.pro_schedule import set_pro_schedule
 from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
 from espn_api.football.helper import (
     build_division_record_dict,
@@ -11,9 +12,15 @@ from espn_api.football.helper import (
     sort_by_points_for,
     sort_by_win_pct,
 )
+from espn_api.player_directory import PlayerDirectory, get_player_directory, set_player_directory
 import requests_mock
+import copy
 import json
+import threading
+import time
 import io
+import os
+import tempfile
 
 
 class LeagueTest(TestCase):
@@ -69,6 +76,100 @@ class LeagueTest(TestCase):
         self.assertEqual(league.current_week, 16)
         self.assertEqual(len(league.teams), 10)
 
+    @requests_mock.Mocker()
+    def test_incremental_refresh(self, m):
+        self.mock_setUp(m)
+
+        league = League(self.league_id, self.season)
+        (team, other) = (league.teams[0], league.teams[1])
+        (roster, schedule, players) = (team.roster, team.schedule, list(team.roster))
+        (wins, roster_size) = (team.wins, len(other.roster))
+
+        data = copy.deepcopy(self.league_data)
+        teams = {team_data['id']: team_data for team_data in data['teams']}
+        teams[team.team_id]['record']['overall']['wins'] += 1
+        teams[other.team_id]['roster']['entries'].pop()
+        player_data = teams[team.team_id]['roster']['entries'][0]['playerPoolEntry']['player']
+        player_data['injuryStatus'] = 'QUESTIONABLE'
+        player_data['stats'] = [{'seasonId': self.season, 'scoringPeriodId': 0, 'statSourceId': 0, 'statSplitTypeId': 0, 'appliedTotal': 123.456, 'appliedAverage': 7.5, 'stats': {}}]
+        m.get(self.espn_endpoint + '?view=mTeam&view=mRoster&view=mMatchup&view=mSettings', status_code=200, json=data)
+        league.refresh()
+
+        # teams are patched in place, an unchanged roster keeps its players
+        self.assertEqual(league.teams, [team, other] + league.teams[2:])
+        self.assertEqual(team.wins, wins + 1)
+        self.assertIs(team.roster, roster)
+        self.assertIs(team.schedule, schedule)
+        self.assertTrue(all(a is b for (a, b) in zip(team.roster, players)))
+        # stats and injuries of the kept players are patched in
+        self.assertEqual(players[0].injuryStatus, 'QUESTIONABLE')
+        self.assertEqual(players[0].total_points, 123.46)
+        self.assertEqual(players[0].avg_points, 7.5)
+        self.assertEqual(len(other.roster), roster_size - 1)
+        self.assertEqual(len(team.schedule), len(team.scores))
+
+    def test_snapshot(self):
+        with requests_mock.Mocker() as m:
+            self.mock_setUp(m)
+            league = League(self.league_id, self.season)
+        path = os.path.join(tempfile.mkdtemp(), 'league.jsonl.gz')
+        league.to_snapshot(path)
+        set_player_directory(None, 'nfl', self.season)
+        set_pro_schedule(self.season, None)
+
+        # no mocked urls so any request fails
+        with requests_mock.Mocker() as m:
+            restored = League.from_snapshot(path)
+            async_league = AsyncLeague.from_snapshot(path)
+        self.assertEqual(len(m.request_history), 0)
+        for other in (restored, async_league):
+            self.assertEqual(other.current_week, league.current_week)
+            self.assertEqual([repr(team.schedule) for team in other.teams], [repr(team.schedule) for team in league.teams])
+            self.assertEqual([repr(team.roster) for team in other.teams], [repr(team.roster) for team in league.teams])
+            self.assertEqual([repr(player.schedule) for team in other.teams for player in team.roster], [repr(player.schedule) for team in league.teams for player in team.roster])
+            self.assertEqual([pick.auction_repr() for pick in other.draft], [pick.auction_repr() for pick in league.draft])
+            self.assertEqual(dict(other.player_map), dict(league.player_map))
+        # schedules link to the restored teams
+        self.assertIn(restored.teams[0].schedule[0], restored.teams)
+
+    @requests_mock.Mocker()
+    def test_parallel_fetch(self, m):
+        self.mock_setUp(m)
+
+        league = League(self.league_id, self.season)
+        parallel_league = League(self.league_id, self.season, parallel_fetch=True)
+        self.assertEqual(len(parallel_league.teams), 10)
+        self.assertEqual([repr(team.schedule) for team in parallel_league.teams], [repr(team.schedule) for team in league.teams])
+        self.assertEqual(repr(parallel_league.draft), repr(league.draft))
+        self.assertEqual(parallel_league.player_map, league.player_map)
+
+    @requests_mock.Mocker()
+    def test_player_directory(self, m):
+        self.mock_setUp(m)
+        set_player_directory(None, 'nfl', self.season)
+
+        league = League(self.league_id, self.season)
+        other = League(self.league_id, self.season)
+        self.assertIs(league.player_map, other.player_map)
+        self.assertIs(league.player_map, get_player_directory('nfl', self.season))
+        self.assertEqual(len([r for r in m.request_history if 'players_wl' in r.url]), 1)
+        self.assertEqual(league.player_map[league.player_map['Fozzy Whittaker']], 'Fozzy Whittaker')
+
+        directory = PlayerDirectory('nfl', self.season, path=os.path.join(tempfile.mkdtemp(), 'players.json'))
+        directory.update([{'id': 1, 'fullName': 'Mike Williams'}, {'id': 2, 'fullName': 'Mike Williams'}, {'id': 3, 'fullName': 'Josh Allen'}])
+        self.assertEqual(directory['Mike Williams'], 1)
+        self.assertEqual(directory.ids('Mike Williams'), [1, 2])
+        self.assertEqual(directory.ids('Josh Allen'), [3])
+        self.assertEqual(directory.ids('Nobody'), [])
+        directory._save()
+
+        # a fresh copy on disk is used instead of downloading
+        restored = PlayerDirectory('nfl', self.season, path=directory.path)
+        restored.ensure(lambda: self.fail('players downloaded again'))
+        self.assertEqual(dict(restored), dict(directory))
+        self.assertEqual(restored.ids('Mike Williams'), [1, 2])
+        set_player_directory(None, 'nfl', self.season)
+
     @requests_mock.Mocker()        
     def test_load_roster_week(self, m):
         self.mock_setUp(m)
@@ -88,6 +189,54 @@ class LeagueTest(TestCase):
                 name = player.name
         self.assertEqual(name, "Le'Veon Bell")
     
+    @requests_mock.Mocker()
+    def test_refresh_after_roster_week(self, m):
+        self.mock_setUp(m)
+        m.get(self.espn_endpoint + '?view=mTeam&view=mRoster&view=mMatchup&view=mSettings', [
+            {'status_code': 200, 'json': self.league_data, 'headers': {'ETag': '"v1"'}},
+            {'status_code': 304},
+        ])
+
+        league = League(self.league_id, self.season)
+        rosters = [[player.playerId for player in team.roster] for team in league.teams]
+        with open('tests/football/unit/data/league_roster_week1.json') as f:
+            data = json.loads(f.read())
+        m.get(self.espn_endpoint + '?view=mRoster&scoringPeriodId=1', status_code=200, json=data)
+        league.load_roster_week(1)
+        self.assertNotEqual([[player.playerId for player in team.roster] for team in league.teams], rosters)
+
+        # the league view is not modified but the current rosters replace the week 1 ones
+        league.refresh()
+        self.assertEqual(m.request_history[-1].headers['If-None-Match'], '"v1"')
+        self.assertEqual([[player.playerId for player in team.roster] for team in league.teams], rosters)
+
+    @requests_mock.Mocker()
+    def test_refresh_draft(self, m):
+        self.mock_setUp(m)
+
+        league = League(self.league_id, self.season)
+        (team, draft) = (league.teams[0], [pick.auction_repr() for pick in league.draft])
+        league.refresh_draft(refresh_players=True, refresh__teams=True)
+        self.assertEqual([pick.auction_repr() for pick in league.draft], draft)
+        self.assertIs(league.teams[0], team)
+
+    @requests_mock.Mocker()
+    def test_snapshot_after_roster_week(self, m):
+        self.mock_setUp(m)
+
+        league = League(self.league_id, self.season)
+        rosters = [repr(team.roster) for team in league.teams]
+        with open('tests/football/unit/data/league_roster_week1.json') as f:
+            data = json.loads(f.read())
+        m.get(self.espn_endpoint + '?view=mRoster&scoringPeriodId=1', status_code=200, json=data)
+        league.load_roster_week(1)
+
+        # the snapshot keeps the league view, so the restored league has the current rosters
+        path = os.path.join(tempfile.mkdtemp(), 'league.jsonl')
+        league.to_snapshot(path)
+        restored = League.from_snapshot(path)
+        self.assertEqual([repr(team.roster) for team in restored.teams], rosters)
+
     @requests_mock.Mocker()        
     def test_league_standings(self, m):
         self.mock_setUp(m)
@@ -384,6 +533,11 @@ class LeagueTest(TestCase):
         scoreboard = league.scoreboard(1)
         self.assertEqual(repr(scoreboard[1]), 'Matchup(Team(Watch What  You Saquon), Team(Feel the  Brees))')
         self.assertEqual(scoreboard[0].home_score, 125.5)
+        self.assertEqual(json.loads(m.last_request.headers['x-fantasy-filter']), {'schedule': {'filterMatchupPeriodIds': {'value': [1]}}})
+
+        scoreboards = league.scoreboard_range(1, 2)
+        self.assertEqual(json.loads(m.last_request.headers['x-fantasy-filter']), {'schedule': {'filterMatchupPeriodIds': {'value': [1, 2]}}})
+        self.assertEqual(repr(scoreboards[1]), repr(scoreboard))
 
         scoreboard = league.scoreboard()
         self.assertEqual(repr(scoreboard[-1]), 'Matchup(Team(Jacking Goff  On Sundays), Team(Feel the  Brees))')
@@ -400,6 +554,9 @@ class LeagueTest(TestCase):
         self.assertEqual(team.roster[0].schedule['1']['team'], 'CAR')
         self.assertEqual(team.get_player_name(2521161), 'Zach Zenner')
         self.assertEqual(team.get_player_name(0), '')
+        self.assertEqual(team.get_player(2521161).name, 'Zach Zenner')
+        self.assertEqual(team.get_player(0), None)
+        self.assertEqual(league.get_player_team(2521161), team)
     
     @requests_mock.Mocker()
     def test_draft(self, m):
@@ -429,6 +586,51 @@ class LeagueTest(TestCase):
     #     self.assertEqual(repr(box_scores[0].home_team), 'Team(Rollin\' With Mahomies)')
     #     self.assertEqual(repr(box_scores[0].home_lineup[1]), 'Player(Christian McCaffrey, points:31, projected:23)')
     
+    @requests_mock.Mocker()
+    def test_box_scores_range(self, m):
+        self.mock_setUp(m)
+
+        league = League(self.league_id, self.season)
+        league.year = 2019
+        (league.current_week, league.currentMatchupPeriod) = (3, 2)
+        league.settings.matchup_periods = {1: [1], 2: [2, 3]}
+        (requested, ratings) = ([], [])
+
+        def get_box_scores(scoring_period, matchup_period):
+            requested.append((scoring_period, matchup_period))
+            return {'schedule': []}
+
+        def get_positional_ratings(scoring_period):
+            ratings.append(scoring_period)
+            return {}
+        league.espn_request.get_box_scores = get_box_scores
+        league._get_positional_ratings = get_positional_ratings
+
+        # week 4 is past the current week so it maps to the current periods
+        weeks = list(league.box_scores_range(1, 4))
+        self.assertEqual(sorted(week for (week, _) in weeks), [1, 2, 3, 4])
+        self.assertEqual(sorted(requested), [(1, 1), (2, 2), (3, 2), (3, 2)])
+        self.assertEqual(sorted(ratings), [1, 2, 3])
+
+        # closing early cancels the weeks that have not started
+        (requested, release, released) = ([], threading.Event(), threading.Event())
+
+        def get_box_scores(scoring_period, matchup_period):
+            requested.append((scoring_period, matchup_period))
+            if scoring_period > 1:
+                release.wait(5)
+                released.set()
+            return {'schedule': []}
+        league.espn_request.get_box_scores = get_box_scores
+        box_scores = league.box_scores_range(1, 3, max_workers=1)
+        self.assertEqual(next(box_scores), (1, []))
+        box_scores.close()
+        release.set()
+        # week 2 may already be running, week 3 was still queued behind it on the single worker
+        released.wait(1)
+        time.sleep(0.1)
+        self.assertNotIn((3, 2), requested)
+
     @requests_mock.Mocker()
     def test_power_rankings(self, m):
         self.mock_setUp(m)
@@ -474,11 +676,25 @@ class LeagueTest(TestCase):
         with open('tests/football/unit/data/league_recent_activity_2019.json') as f:
             data = json.loads(f.read())
         m.get(self.espn_endpoint + '/communication/?view=kona_league_communication', status_code=200, json=data)
-        m.get(self.espn_endpoint + '?view=kona_playercard', status_code=200, json=self.player_card_data)
+        # the card is served as dropped player 9354, every other id off a roster is missing from it
+        card_data = copy.deepcopy(self.player_card_data)
+        card_data['players'][0]['id'] = card_data['players'][0]['player']['id'] = 9354
+        m.get(self.espn_endpoint + '?view=kona_playercard', status_code=200, json=card_data)
 
         activity  = league.recent_activity()
         self.assertEqual(repr(activity[0].actions[0][0]), 'Team(Perscription Mixon)')
-        self.assertEqual(len(repr(activity)), 2765)
+        actions = [(msg['targetId'], action) for (topic, item) in zip(data['topics'], activity) for (msg, action) in zip(topic['messages'], item.actions)]
+        self.assertEqual(len(actions), 43)
+        for (playerId, (team, _, player, _)) in actions:
+            if team and team.get_player(playerId):
+                self.assertIs(player, team.get_player(playerId))
+            elif playerId == 9354:
+                self.assertEqual(repr(player), 'Player(James Conner)')
+            else:
+                self.assertIsNone(player)
+        self.assertIn(9354, [playerId for (playerId, (_, _, player, _)) in actions if player is not None])
+        # players off the rosters are resolved with a single player card request
+        self.assertEqual(len([r for r in m.request_history if 'kona_playercard' in r.url]), 1)
 
     @mock.patch.object(League, '_fetch_league')
     def test_cookie_set(self, mock_fetch_league):
@@ -502,6 +718,15 @@ class LeagueTest(TestCase):
         self.assertEqual(player.stats[1]['points'], 10.5)
         self.assertEqual(player.percent_owned, 96.73)
         self.assertEqual(player.percent_started, 73.87)
+
+        # a name shared by several players returns the first one unless all matches are asked for
+        league.player_directory.update([{'id': 3045147, 'fullName': 'James Conner'}, {'id': 1, 'fullName': 'James Conner'}])
+        player = league.player_info('James Conner')
+        self.assertEqual(player.name, 'James Conner')
+        players = league.player_info('James Conner', all_matches=True)
+        self.assertEqual([player.name for player in players], ['James Conner'])
+        self.assertEqual(json.loads(m.last_request.headers['x-fantasy-filter'])['players']['filterIds']['value'], [3045147, 1])
+        set_player_directory(None, 'nfl', self.season)
         
 
 
@@ -0,0 +1,76 @@
+from unittest import TestCase
+from espn_api.football import LeagueHistory
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+from espn_api.requests.espn_requests import ESPNAccessDenied
+from espn_api.requests.transport import Transport
+from espn_api.requests.retry import RetryPolicy
+import requests_mock
+import json
+
+
+class LeagueHistoryTest(TestCase):
+    def setUp(self):
+        self.league_id = 123
+        self.espn_endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/2018/segments/0/leagues/' + str(self.league_id)
+        self.history_endpoint = FANTASY_BASE_ENDPOINT + 'ffl/leagueHistory/' + str(self.league_id) + '?seasonId=2015'
+        with open('tests/football/unit/data/league_2018_data.json') as data:
+            self.league_data = json.loads(data.read())
+        with open('tests/football/unit/data/league_draft_2018.json') as data:
+            self.draft_data = json.loads(data.read())
+        with open('tests/football/unit/data/league_players_2018.json') as data:
+            self.players_data = json.loads(data.read())
+        with open('tests/football/unit/data/league_2015_data.json') as data:
+            self.past_league_data = json.loads(data.read())
+        with open('tests/football/unit/data/league_draft_2015.json') as data:
+            self.past_draft_data = json.loads(data.read())
+        with open('tests/football/unit/data/league_players_2015.json') as data:
+            self.past_players_data = json.loads(data.read())
+        with open('tests/football/unit/data/pro_schedule_2024.json') as data:
+            self.pro_schedule_data = json.loads(data.read())
+
+    def mock_setUp(self, m):
+        m.get(self.espn_endpoint + '?view=mTeam&view=mRoster&view=mMatchup&view=mSettings', status_code=200, json=self.league_data)
+        m.get(self.espn_endpoint + '?view=mDraftDetail', status_code=200, json=self.draft_data)
+        m.get(self.history_endpoint + '&view=mTeam&view=mRoster&view=mMatchup&view=mSettings', status_code=200, json=self.past_league_data)
+        m.get(self.history_endpoint + '&view=mDraftDetail', status_code=200, json=self.past_draft_data)
+        for (year, players_data) in ((2018, self.players_data), (2015, self.past_players_data)):
+            base_endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/' + str(year)
+            m.get(base_endpoint + '/players?view=players_wl', status_code=200, json=players_data)
+            m.get(base_endpoint + '?view=proTeamSchedules_wl', status_code=200, json=self.pro_schedule_data)
+
+    @requests_mock.Mocker()
+    def test_create_object(self, m):
+        self.mock_setUp(m)
+
+        # 2016 is not mocked so it fails without stopping the other seasons
+        history = LeagueHistory(self.league_id, 2018, years=[2015, 2016, 2018], transport=Transport(retry=RetryPolicy(max_retries=0)))
+        self.assertEqual(repr(history), 'LeagueHistory(123, [2015, 2018])')
+        self.assertEqual(list(history.errors), [2016])
+        self.assertEqual(history[2015].year, 2015)
+        self.assertEqual(len(history[2018].teams), 10)
+
+    @requests_mock.Mocker()
+    def test_current_season_error(self, m):
+        m.get(self.espn_endpoint + '?view=mTeam&view=mRoster&view=mMatchup&view=mSettings', status_code=401)
+
+        history = LeagueHistory(self.league_id, 2018, transport=Transport(retry=RetryPolicy(max_retries=0)))
+        self.assertEqual(len(history), 0)
+        self.assertIsInstance(history.errors[2018], ESPNAccessDenied)
+
+    @requests_mock.Mocker()
+    def test_records(self, m):
+        self.mock_setUp(m)
+
+        history = LeagueHistory(self.league_id, 2018, years=[2015, 2018])
+        records = history.all_time_records()
+        self.assertEqual(sum(record['wins'] for record in records), sum(team.wins for league in history for team in league.teams))
+        self.assertEqual(records, sorted(records, key=lambda x: (x['wins'], x['points_for']), reverse=True))
+
+        (owner, opponent) = (records[0]['owner'], records[1]['owner'])
+        record = history.head_to_head(owner, opponent)
+        other = history.head_to_head(records[1]['name'], owner)
+        self.assertEqual((record['games'], record['wins'], record['ties']), (other['games'], other['losses'], other['ties']))
+        self.assertEqual(record['points_for'], other['points_against'])
+        self.assertEqual(history.head_to_head(owner).get(opponent, record), record)
+        with self.assertRaises(Exception):
+            history.head_to_head('Not An Owner')
@@ -0,0 +1,56 @@
+from unittest import TestCase
+from espn_api.football import LeagueManager
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+from espn_api.requests.espn_requests import ESPNAccessDenied
+from espn_api.requests.transport import Transport
+from espn_api.requests.retry import RetryPolicy
+import requests_mock
+import json
+
+
+class LeagueManagerTest(TestCase):
+    def setUp(self):
+        self.season = 2018
+        self.base_endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/' + str(self.season)
+        with open('tests/football/unit/data/league_2018_data.json') as data:
+            self.league_data = json.loads(data.read())
+        with open('tests/football/unit/data/league_draft_2018.json') as data:
+            self.draft_data = json.loads(data.read())
+        with open('tests/football/unit/data/league_players_2018.json') as data:
+            self.players_data = json.loads(data.read())
+        with open('tests/football/unit/data/pro_schedule_2024.json') as data:
+            self.pro_schedule_data = json.loads(data.read())
+
+    def league_endpoint(self, league_id):
+        return self.base_endpoint + '/segments/0/leagues/' + str(league_id)
+
+    def mock_setUp(self, m, league_ids):
+        for league_id in league_ids:
+            m.get(self.league_endpoint(league_id) + '?view=mTeam&view=mRoster&view=mMatchup&view=mSettings', status_code=200, json=self.league_data)
+            m.get(self.league_endpoint(league_id) + '?view=mDraftDetail', status_code=200, json=self.draft_data)
+        m.get(self.base_endpoint + '/players?view=players_wl', status_code=200, json=self.players_data)
+        m.get(self.base_endpoint + '?view=proTeamSchedules_wl', status_code=200, json=self.pro_schedule_data)
+
+    @requests_mock.Mocker()
+    def test_load_and_refresh(self, m):
+        self.mock_setUp(m, [123, 124])
+        m.get(self.league_endpoint(456) + '?view=mTeam&view=mRoster&view=mMatchup&view=mSettings', status_code=401)
+
+        cookies = {'espn_s2': 'cookie', 'SWID': '{swid}'}
+        manager = LeagueManager([(123, self.season), (124, self.season, cookies), (456, self.season)], max_workers=3, transport=Transport(retry=RetryPolicy(max_retries=0)))
+        failures = manager.load()
+        self.assertEqual(list(failures), [(456, self.season)])
+        self.assertIsInstance(manager.errors[(456, self.season)], ESPNAccessDenied)
+        self.assertEqual(len(manager), 2)
+        self.assertEqual(len(manager[(123, self.season)].teams), 10)
+        self.assertEqual(manager[(124, self.season)].espn_request.cookies, cookies)
+        self.assertIs(manager[(123, self.season)].espn_request.transport, manager[(124, self.season)].espn_request.transport)
+        self.assertEqual(len([r for r in m.request_history if 'players_wl' in r.url]), 1)
+
+        # a refresh keeps loaded leagues and loads the ones that failed before
+        team = manager[(123, self.season)].teams[0]
+        self.mock_setUp(m, [456])
+        self.assertEqual(manager.refresh(), {})
+        self.assertIs(manager[(123, self.season)].teams[0], team)
+        self.assertEqual(len(manager), 3)
+        self.assertEqual(manager.errors, {})
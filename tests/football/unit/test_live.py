@@ -0,0 +1,78 @@
+from unittest import TestCase
+from espn_api.football import League, LiveScoreboard
+from espn_api.football.live import PlayerPointsChanged, TeamScoreChanged, MatchupDecided
+from espn_api.requests.constant import FANTASY_BASE_ENDPOINT
+import requests_mock
+import asyncio
+import threading
+
+
+def box_scores(home_score, away_score, points, winner='UNDECIDED'):
+    player = {'id': 1, 'fullName': 'Drew Brees', 'stats': [{'scoringPeriodId': 1, 'statSourceId': 0, 'appliedTotal': points}]}
+    return {'schedule': [{
+        'id': 1,
+        'matchupPeriodId': 1,
+        'winner': winner,
+        'home': {'teamId': 1, 'totalPoints': home_score, 'rosterForCurrentScoringPeriod': {'entries': [{'playerPoolEntry': {'player': player}}]}},
+        'away': {'teamId': 2, 'totalPoints': away_score, 'rosterForCurrentScoringPeriod': {'entries': []}},
+    }]}
+
+
+class LiveScoreboardTest(TestCase):
+    def setUp(self):
+        self.league_id = 123
+        self.season = 2019
+        self.espn_endpoint = FANTASY_BASE_ENDPOINT + 'ffl/seasons/' + str(self.season) + '/segments/0/leagues/' + str(self.league_id)
+        self.league = League(self.league_id, self.season, fetch_league=False)
+        self.league.current_week = 1
+        self.league.currentMatchupPeriod = 1
+
+    @requests_mock.Mocker()
+    def test_poll(self, m):
+        m.get(self.espn_endpoint + '?view=mMatchupScore&view=mScoreboard&scoringPeriodId=1', [
+            {'json': box_scores(10, 5, 10)},
+            {'json': box_scores(10, 5, 10)},
+            {'json': box_scores(16.5, 5, 16.5)},
+            {'json': box_scores(16.5, 5, 16.5, winner='HOME')},
+        ])
+
+        scoreboard = LiveScoreboard(self.league, interval=0)
+        seen = []
+        scoreboard.subscribe(seen.append)
+        self.assertEqual(scoreboard.poll(), [])
+        self.assertEqual(scoreboard.poll(), [])
+
+        events = scoreboard.poll()
+        self.assertEqual([type(event) for event in events], [PlayerPointsChanged, TeamScoreChanged])
+        self.assertEqual((events[0].player_name, events[0].old_points, events[0].points), ('Drew Brees', 10, 16.5))
+        self.assertEqual((events[1].team_id, events[1].old_score, events[1].score), (1, 10, 16.5))
+
+        events = scoreboard.poll()
+        self.assertEqual([type(event) for event in events], [MatchupDecided])
+        self.assertEqual(events[0].winner, 'HOME')
+        self.assertEqual(len(seen), 3)
+
+    @requests_mock.Mocker()
+    def test_async_iterator(self, m):
+        m.get(self.espn_endpoint + '?view=mMatchupScore&view=mScoreboard&scoringPeriodId=1', [
+            {'json': box_scores(10, 5, 10)},
+            {'json': box_scores(12, 5, 12)},
+        ])
+
+        scoreboard = LiveScoreboard(self.league, interval=0)
+        threads = []
+        scoreboard.subscribe(lambda event: threads.append(threading.current_thread().name))
+
+        async def first_events():
+            events = []
+            async for event in scoreboard:
+                events.append(event)
+                if len(events) == 2:
+                    scoreboard.stop()
+            return events
+
+        events = asyncio.run(first_events())
+        self.assertEqual([event.matchup_id for event in events], [1, 1])
+        self.assertEqual(events[1].score, 12)
+        # polls run on the shared espn_api pool
+        self.assertTrue(threads and all(name.startswith('espn_api') for name in threads))